@@ -0,0 +1,44 @@
+"""event_calendar rollup
+
+Revision ID: a7d3e2b94c18
+Revises: f2c86d4a1e95
+Create Date: 2026-10-18 15:02:37.118406
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a7d3e2b94c18'
+down_revision = 'f2c86d4a1e95'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('event_calendar',
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('country_id', sa.Integer(), nullable=False),
+    sa.Column('city_id', sa.Integer(), nullable=False),
+    sa.Column('tag_id', sa.Integer(), nullable=False),
+    sa.Column('event_count', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('day', 'country_id', 'city_id', 'tag_id')
+    )
+
+    # Backfill the rollup from the read model, tag_id 0 counts over all tags
+    op.execute(
+        """
+        INSERT INTO event_calendar (day, country_id, city_id, tag_id, event_count)
+        SELECT CAST(timezone('UTC', event_listing.start_date) AS DATE),
+            event_listing.country_id, event_listing.city_id, calendar_tags.tag_id, count(*)
+        FROM event_listing
+        JOIN unnest(array_prepend(0, event_listing.tag_ids)) AS calendar_tags(tag_id) ON true
+        WHERE event_listing.status = 'PUBLIC'
+        GROUP BY 1, 2, 3, 4
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('event_calendar')
@@ -0,0 +1,80 @@
+"""event_listing read model
+
+Revision ID: c3d52a9e7f10
+Revises: b81f0c2d5e47
+Create Date: 2026-10-18 10:05:12.503114
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = 'c3d52a9e7f10'
+down_revision = 'b81f0c2d5e47'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('event_listing',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('organizer_id', sa.Integer(), nullable=False),
+    sa.Column('event_name', sa.String(), nullable=False),
+    sa.Column('street_addr', sa.String(), nullable=False),
+    sa.Column('description', postgresql.TEXT(), nullable=False),
+    sa.Column('phone_contact', sa.String(), nullable=False),
+    sa.Column('pictures', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+    sa.Column('details', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+    sa.Column('status', postgresql.ENUM('HIDDEN', 'PUBLIC', name='event_status', create_type=False), nullable=False),
+    sa.Column('start_date', postgresql.TIMESTAMP(timezone=True), nullable=False),
+    sa.Column('end_date', postgresql.TIMESTAMP(timezone=True), nullable=False),
+    sa.Column('country_id', sa.Integer(), nullable=False),
+    sa.Column('city_id', sa.Integer(), nullable=False),
+    sa.Column('organizer', sa.String(), nullable=True),
+    sa.Column('country', sa.String(), nullable=False),
+    sa.Column('city', sa.String(), nullable=False),
+    sa.Column('tags', postgresql.JSONB(astext_type=sa.Text()), server_default=sa.text("'[]'::jsonb"), nullable=False),
+    sa.ForeignKeyConstraint(['id'], ['events.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_event_listing_city_id'), 'event_listing', ['city_id'], unique=False)
+    op.create_index(op.f('ix_event_listing_country_id'), 'event_listing', ['country_id'], unique=False)
+    op.create_index(op.f('ix_event_listing_organizer_id'), 'event_listing', ['organizer_id'], unique=False)
+    op.create_index('ix_event_listing_start_date_id', 'event_listing', ['start_date', 'id'], unique=False)
+
+    # Listings read event_listing from now on, the events index only slows writes
+    op.drop_index('ix_events_start_date_id', table_name='events')
+
+    # Backfill the read model from the existing events
+    op.execute(
+        """
+        INSERT INTO event_listing
+        SELECT events.id, events.organizer_id, events.event_name, events.street_addr,
+            events.description, events.phone_contact, events.pictures, events.details,
+            events.status, events.start_date, events.end_date,
+            events.country, events.city,
+            organizations.organization_name, countries.label, cities.label,
+            coalesce(
+                jsonb_agg(jsonb_build_object('value', tags.id, 'label', tags.label) ORDER BY tags.id)
+                    FILTER (WHERE tags.id IS NOT NULL),
+                '[]'::jsonb
+            )
+        FROM events
+        LEFT OUTER JOIN organizations ON organizations.id = events.organizer_id
+        JOIN countries ON events.country = countries.id
+        JOIN cities ON events.city = cities.id
+        LEFT OUTER JOIN event_tags ON events.id = event_tags.event_id
+        LEFT OUTER JOIN tags ON event_tags.tag_id = tags.id
+        GROUP BY events.id, countries.label, cities.label, organizations.organization_name
+        """
+    )
+
+
+def downgrade() -> None:
+    op.create_index('ix_events_start_date_id', 'events', ['start_date', 'id'], unique=False)
+    op.drop_index('ix_event_listing_start_date_id', table_name='event_listing')
+    op.drop_index(op.f('ix_event_listing_organizer_id'), table_name='event_listing')
+    op.drop_index(op.f('ix_event_listing_country_id'), table_name='event_listing')
+    op.drop_index(op.f('ix_event_listing_city_id'), table_name='event_listing')
+    op.drop_table('event_listing')
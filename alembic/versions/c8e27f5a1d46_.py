@@ -0,0 +1,54 @@
+"""metadata_version
+
+Revision ID: c8e27f5a1d46
+Revises: b4f81c6d0e23
+Create Date: 2026-10-18 17:08:14.356920
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c8e27f5a1d46'
+down_revision = 'b4f81c6d0e23'
+branch_labels = None
+depends_on = None
+
+
+METADATA_TABLES = ('countries', 'cities', 'tags')
+
+
+def upgrade() -> None:
+    op.create_table('metadata_version',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('version', sa.BigInteger(), server_default=sa.text('0'), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.execute("INSERT INTO metadata_version (id, version) VALUES (1, 0)")
+
+    op.execute(
+        """
+        CREATE FUNCTION bump_metadata_version() RETURNS trigger AS $$
+        BEGIN
+            UPDATE metadata_version SET version = version + 1 WHERE id = 1;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+        """
+    )
+    for table in METADATA_TABLES:
+        op.execute(
+            f"""
+            CREATE TRIGGER {table}_metadata_version
+            AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON {table}
+            FOR EACH STATEMENT EXECUTE FUNCTION bump_metadata_version()
+            """
+        )
+
+
+def downgrade() -> None:
+    for table in METADATA_TABLES:
+        op.execute(f"DROP TRIGGER {table}_metadata_version ON {table}")
+    op.execute("DROP FUNCTION bump_metadata_version()")
+    op.drop_table('metadata_version')
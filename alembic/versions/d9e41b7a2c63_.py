@@ -0,0 +1,38 @@
+"""event_listing tag_ids array with GIN index
+
+Revision ID: d9e41b7a2c63
+Revises: c3d52a9e7f10
+Create Date: 2026-10-18 11:20:37.914502
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = 'd9e41b7a2c63'
+down_revision = 'c3d52a9e7f10'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('event_listing', sa.Column('tag_ids', postgresql.ARRAY(sa.Integer()), server_default=sa.text("'{}'"), nullable=False))
+    op.execute(
+        """
+        UPDATE event_listing
+        SET tag_ids = event_tag_ids.tag_ids
+        FROM (
+            SELECT event_id, array_agg(tag_id ORDER BY tag_id) AS tag_ids
+            FROM event_tags
+            GROUP BY event_id
+        ) AS event_tag_ids
+        WHERE event_listing.id = event_tag_ids.event_id
+        """
+    )
+    op.create_index('ix_event_listing_tag_ids', 'event_listing', ['tag_ids'], unique=False, postgresql_using='gin')
+
+
+def downgrade() -> None:
+    op.drop_index('ix_event_listing_tag_ids', table_name='event_listing', postgresql_using='gin')
+    op.drop_column('event_listing', 'tag_ids')
@@ -0,0 +1,26 @@
+"""event_listing full text search vector
+
+Revision ID: e5a07c3f9b21
+Revises: d9e41b7a2c63
+Create Date: 2026-10-18 12:02:51.337460
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = 'e5a07c3f9b21'
+down_revision = 'd9e41b7a2c63'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('event_listing', sa.Column('search_vector', postgresql.TSVECTOR(), sa.Computed("setweight(to_tsvector('english', event_name), 'A') || setweight(to_tsvector('english', description), 'B')", persisted=True), nullable=True))
+    op.create_index('ix_event_listing_search_vector', 'event_listing', ['search_vector'], unique=False, postgresql_using='gin')
+
+
+def downgrade() -> None:
+    op.drop_index('ix_event_listing_search_vector', table_name='event_listing', postgresql_using='gin')
+    op.drop_column('event_listing', 'search_vector')
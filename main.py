@@ -11,10 +11,32 @@ from src.endpoints.user import router as user_router
 from src.endpoints.upload import router as upload_router
 
 from src.core.config import settings
+from src.dependencies.database import SessionFactory
+from src.dependencies.http import create_http_client
+from src.services import metadata_cache
 
 from minio import Minio
 
-app = FastAPI(default_response_class=ORJSONResponse)
+from contextlib import asynccontextmanager
+import asyncio
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    app.state.http_client = create_http_client()
+
+    async with SessionFactory() as db_session:
+        await metadata_cache.reload(db_session)
+
+    version_check = asyncio.create_task(metadata_cache.watch_version())
+
+    yield
+
+    version_check.cancel()
+    await app.state.http_client.aclose()
+
+
+app = FastAPI(default_response_class=ORJSONResponse, lifespan=lifespan)
 
 origins = [
     "http://localhost",
@@ -21,6 +21,31 @@ class Settings(BaseSettings):
     IMAGE_BUCKET_NAME: str
     MINIO_PORT: str
 
+    EVENT_COUNT_CACHE_TTL_SECONDS: int = 60
+    EVENT_COUNT_CACHE_SIZE: int = 1024
+    EVENT_COUNT_ESTIMATE_THRESHOLD: int = 10000
+    EVENT_PAGE_CACHE_TTL_SECONDS: int = 30
+    EVENT_PAGE_CACHE_SIZE: int = 512
+    EVENT_BULK_MAX_SIZE: int = 500
+    EVENT_BATCH_MAX_SIZE: int = 100
+    EVENT_EXPORT_BATCH_SIZE: int = 500
+    METADATA_VERSION_CHECK_SECONDS: int = 60
+    METADATA_MAX_AGE_SECONDS: int = 86400
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_PENDING: int = 64
+    USER_CACHE_TTL_SECONDS: int = 30
+    USER_CACHE_SIZE: int = 4096
+    TOKEN_CACHE_SIZE: int = 8192
+    HTTP_TIMEOUT_SECONDS: float = 5.0
+    HTTP_CONNECT_TIMEOUT_SECONDS: float = 2.0
+    HTTP_MAX_CONNECTIONS: int = 100
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    HTTP_RETRIES: int = 2
+    GOOGLE_USERINFO_URL: str = "https://www.googleapis.com/oauth2/v3/userinfo"
+    GOOGLE_USERINFO_CACHE_TTL_SECONDS: int = 300
+    GOOGLE_USERINFO_CACHE_SIZE: int = 1024
+
     class Config:
         env_file = '.dev.env'
         env_file_encoding = 'utf-8'
@@ -1,11 +1,98 @@
 from passlib.context import CryptContext
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from src.core.config import settings
+from src.exceptions import ServiceUnavailableException
 
+from concurrent.futures import Future, ThreadPoolExecutor
+import asyncio
+import threading
 
-def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+# Hashes below BCRYPT_ROUNDS are flagged by verify_and_update and rehashed on
+# the next successful login
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__min_rounds=settings.BCRYPT_ROUNDS,
+)
 
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+class HashPool:
+    """
+    Runs bcrypt on a few worker threads so it never blocks the event loop.
+    bcrypt releases the GIL while it hashes, threads run in parallel.
+
+    At most max_pending calls are running or queued, more are refused with a
+    503 instead of piling up behind a login burst.
+    """
+
+    def __init__(self, workers: int, max_pending: int):
+        self.workers = workers
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bcrypt")
+        # Counters are changed from the worker threads too
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._running = 0
+        self._completed = 0
+        self._rejected = 0
+
+    def _run(self, func, *args):
+        with self._lock:
+            self._running += 1
+        try:
+            return func(*args)
+        finally:
+            with self._lock:
+                self._running -= 1
+
+    def _release(self, future: Future):
+        with self._lock:
+            self._pending -= 1
+            if not future.cancelled():
+                self._completed += 1
+
+    async def submit(self, func, *args):
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self._rejected += 1
+                raise ServiceUnavailableException("Too many password checks in progress")
+            self._pending += 1
+
+        # The slot is held until the hash itself is done, a cancelled caller
+        # does not free it while the thread is still hashing
+        future = self._executor.submit(self._run, func, *args)
+        future.add_done_callback(self._release)
+
+        return await asyncio.wrap_future(future)
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "max_pending": self.max_pending,
+                "running": self._running,
+                "queued": max(self._pending - self._running, 0),
+                "completed": self._completed,
+                "rejected": self._rejected,
+            }
+
+
+hash_pool = HashPool(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+)
+
+
+async def get_password_hash(password: str) -> str:
+    return await hash_pool.submit(pwd_context.hash, password)
+
+
+async def verify_and_update_password(
+    plain_password: str, hashed_password: str
+) -> tuple[bool, str | None]:
+    """
+    Verify a password, and return a new hash of it too when the stored one
+    uses an outdated cost factor
+    """
+    return await hash_pool.submit(pwd_context.verify_and_update, plain_password, hashed_password)
@@ -1,7 +1,11 @@
 import uuid
 import sys
+import hashlib
+import time
 from datetime import timedelta, datetime, timezone
 
+from cachetools import LRUCache
+
 from jose import jwt, JWTError
 from fastapi import Response
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -33,16 +37,63 @@ def _create_token(payload: dict, expire: datetime) -> JwtTokenSchema:
         payload=payload,
     )
 
+# Payloads of tokens already verified, by token digest. Entries are checked
+# against exp and the revoked jtis on every hit, so a cached token is never
+# accepted after it stopped being valid.
+_verified_tokens: LRUCache = LRUCache(maxsize=config.settings.TOKEN_CACHE_SIZE)
+
+# Revoked jti -> time it can be forgotten. The access and refresh tokens of a
+# login share their jti, it is kept until the later of the two expires.
+_revoked_jtis: dict[str, float] = {}
+
+
+def _token_digest(token: str) -> bytes:
+    return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+
+def revoke_token(payload: dict):
+    now = time.time()
+    for revoked_jti, revoked_until in list(_revoked_jtis.items()):
+        if revoked_until <= now:
+            del _revoked_jtis[revoked_jti]
+
+    refresh_exp = payload.get(IAT, now) + config.settings.REFRESH_TOKEN_EXPIRES_MINUTES * 60
+    _revoked_jtis[payload[JTI]] = max(payload.get(EXP, now), refresh_exp)
+
+
+def is_revoked(payload: dict) -> bool:
+    return payload.get(JTI) in _revoked_jtis
+
+
 def decode_token(token: str | None) -> dict | None:
     if token is None:
         return None
+
+    digest = _token_digest(token)
+    payload = _verified_tokens.get(digest)
+
+    if payload is not None:
+        if payload[EXP] <= time.time():
+            _verified_tokens.pop(digest, None)
+            return None
+        return None if is_revoked(payload) else payload
+
     try:
-        return jwt.decode(
+        payload = jwt.decode(
             token, config.settings.SECRET_KEY, algorithms=[config.settings.ALGORITHM]
         )
     except JWTError:
         return None
 
+    if is_revoked(payload):
+        return None
+
+    # Tokens without exp are not cached, nothing would ever expire them
+    if EXP in payload:
+        _verified_tokens[digest] = payload
+
+    return payload
+
 
 async def decode_access_token(token: str):
     try:
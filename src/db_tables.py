@@ -2,14 +2,19 @@ from sqlalchemy import (
     MetaData,
     Table,
     Column,
+    BigInteger,
     Integer,
     String,
     Enum,
     ForeignKey,
+    Computed,
+    Date,
+    Float,
     PrimaryKeyConstraint,
+    Index,
     text,
 )
-from sqlalchemy.dialects.postgresql import JSONB, TIMESTAMP, TEXT
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB, TIMESTAMP, TEXT, TSVECTOR
 
 metadata_obj = MetaData()
 from src import schemas
@@ -30,7 +35,7 @@ users = Table(
     "users",
     metadata_obj,
     Column("id", Integer, primary_key=True),
-    Column("email", String, nullable=False, index=True),
+    Column("email", String, nullable=False, index=True, unique=True),
     Column("password", String, nullable=True),
     Column("first_name", String, nullable=False),
     Column("last_name", String, nullable=False),
@@ -70,7 +75,70 @@ events = Table(
         nullable=False,
     ),
     Column("country", ForeignKey("countries.id"), nullable=False, index=True),
-    Column("city", ForeignKey("cities.id"), nullable=False, index=True)
+    Column("city", ForeignKey("cities.id"), nullable=False, index=True),
+    Column("version", Integer, nullable=False, server_default=text("1")),
+    Column(
+        "updated_at",
+        TIMESTAMP(timezone=True),
+        server_default=text("current_timestamp"),
+        nullable=False,
+    ),
+)
+
+EVENT_SEARCH_CONFIG = "english"
+
+# Read model of events with the organizer, location labels and tags already
+# joined in, kept up to date by src.services.event.refresh_event_listing
+event_listing = Table(
+    "event_listing",
+    metadata_obj,
+    Column("id", ForeignKey("events.id", ondelete="CASCADE"), primary_key=True),
+    Column("organizer_id", Integer, nullable=False, index=True),
+    Column("event_name", String, nullable=False),
+    Column("street_addr", String, nullable=False),
+    Column("description", TEXT, nullable=False),
+    Column("phone_contact", String, nullable=False),
+    Column("pictures", JSONB, nullable=True),
+    Column("details", JSONB, nullable=True),
+    Column("status", event_status_enum, nullable=False),
+    Column("start_date", TIMESTAMP(timezone=True), nullable=False),
+    Column("end_date", TIMESTAMP(timezone=True), nullable=False),
+    Column("version", Integer, nullable=False, server_default=text("1")),
+    Column("country_id", Integer, nullable=False, index=True),
+    Column("city_id", Integer, nullable=False, index=True),
+    Column("organizer", String, nullable=True),
+    Column("country", String, nullable=False),
+    Column("city", String, nullable=False),
+    Column("tags", JSONB, nullable=False, server_default=text("'[]'::jsonb")),
+    Column("tag_ids", ARRAY(Integer), nullable=False, server_default=text("'{}'")),
+    Column("latitude", Float, nullable=True),
+    Column("longitude", Float, nullable=True),
+    Column(
+        "search_vector",
+        TSVECTOR,
+        Computed(
+            f"setweight(to_tsvector('{EVENT_SEARCH_CONFIG}', event_name), 'A') || "
+            f"setweight(to_tsvector('{EVENT_SEARCH_CONFIG}', description), 'B')",
+            persisted=True,
+        ),
+    ),
+    Index("ix_event_listing_start_date_id", "start_date", "id"),
+    Index("ix_event_listing_tag_ids", "tag_ids", postgresql_using="gin"),
+    Index("ix_event_listing_search_vector", "search_vector", postgresql_using="gin"),
+    Index("ix_event_listing_latitude_longitude", "latitude", "longitude"),
+)
+
+# Public events starting each day, per city and tag. tag_id 0 holds the
+# count over all tags, so untagged events are counted and tagged ones only once
+event_calendar = Table(
+    "event_calendar",
+    metadata_obj,
+    Column("day", Date, nullable=False),
+    Column("country_id", Integer, nullable=False),
+    Column("city_id", Integer, nullable=False),
+    Column("tag_id", Integer, nullable=False),
+    Column("event_count", Integer, nullable=False),
+    PrimaryKeyConstraint("day", "country_id", "city_id", "tag_id"),
 )
 
 event_applications = Table(
@@ -177,6 +245,17 @@ cities = Table(
     Column("id", Integer, primary_key=True),
     Column("label", String, nullable=False),
     Column("country", ForeignKey("countries.id"), nullable=False, index=True),
+    Column("latitude", Float, nullable=True),
+    Column("longitude", Float, nullable=True),
+)
+
+# Single row, bumped by triggers on countries, cities and tags so in-process
+# metadata caches can tell when to reload
+metadata_version = Table(
+    "metadata_version",
+    metadata_obj,
+    Column("id", Integer, primary_key=True),
+    Column("version", BigInteger, nullable=False, server_default=text("0")),
 )
 
 tags = Table(
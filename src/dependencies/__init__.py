@@ -1,12 +1,15 @@
 from src.dependencies.database import get_db
 from src.dependencies.user import get_current_user
+from src.dependencies.http import get_http_client
 
 from typing import Annotated
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src import schemas
 from fastapi import Depends
+import httpx
 
 
 UserDependency = Annotated[schemas.UserResponse, Depends(get_current_user)]
 DatabaseDependency = Annotated[AsyncSession, Depends(get_db)]
+HttpClientDependency = Annotated[httpx.AsyncClient, Depends(get_http_client)]
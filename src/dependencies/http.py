@@ -0,0 +1,28 @@
+from fastapi import Request
+
+from src.core.config import settings
+
+import httpx
+
+
+def create_http_client() -> httpx.AsyncClient:
+    """
+    Client shared by the whole application, its pool keeps connections to
+    outside APIs open between requests. The transport retries failed
+    connection attempts only, a request that reached the server is never sent
+    twice.
+    """
+    return httpx.AsyncClient(
+        timeout=httpx.Timeout(
+            settings.HTTP_TIMEOUT_SECONDS, connect=settings.HTTP_CONNECT_TIMEOUT_SECONDS
+        ),
+        limits=httpx.Limits(
+            max_connections=settings.HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        ),
+        transport=httpx.AsyncHTTPTransport(retries=settings.HTTP_RETRIES),
+    )
+
+
+async def get_http_client(request: Request):
+    return request.app.state.http_client
@@ -8,13 +8,14 @@ from src.dependencies.database import get_db
 from src.core.jwt import (
     decode_token,
     SUB,
+    JTI,
     refresh_token_state
 )
 
 from src import schemas
 
 
-from src.services import user as user_service
+from src.services import user_cache
 from src.exceptions import AuthTokenExpiredException
 
 
@@ -48,4 +49,4 @@ async def get_current_user(
     if payload is None:
         raise AuthTokenExpiredException
 
-    return await user_service.user_by_id(db_session, int(payload[SUB]))
+    return await user_cache.get_user(int(payload[SUB]), payload.get(JTI))
@@ -4,18 +4,23 @@ from fastapi import APIRouter, HTTPException, Depends, Response, Body
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.dependencies import DatabaseDependency
+from src.dependencies import DatabaseDependency, HttpClientDependency, UserDependency
 
-from src.core.hash import get_password_hash, verify_password
+from src.core.hash import get_password_hash, verify_and_update_password, hash_pool
 from src.core.jwt import (
-    create_and_inject_token
+    create_and_inject_token,
+    decode_token,
+    revoke_token,
+    JTI,
 )
+from src.dependencies.user import oauth2_scheme
 from src.exceptions import BadRequestException
 from src import schemas
 from src.schemas import responses
 
 
 from src.services import user as user_service
+from src.services.google import fetch_google_data
 
 import httpx
 
@@ -28,51 +33,35 @@ async def register(
     response: Response,
     db_session: DatabaseDependency,
 ):
-    user_exist = await user_service.user_exist_by_email(db_session, data.email)
-
-    if user_exist:
-        raise HTTPException(status_code=400, detail="Email has already registered")
-
-    hashed_password = get_password_hash(data.password)
+    hashed_password = await get_password_hash(data.password)
 
     created_user = await user_service.create_user_by_email(
         db_session, data, hashed_password, None
     )
 
+    if created_user is None:
+        raise HTTPException(status_code=400, detail="Email has already registered")
+
     create_and_inject_token(response, created_user)
 
     await db_session.commit()
 
     return {}
 
-async def fetch_google_data(token: str) -> schemas.GoogleCredentalData:
-    async with httpx.AsyncClient() as http_client:
-        try:
-            user_data = await http_client.get(
-                f"https://www.googleapis.com/oauth2/v3/userinfo?access_token={token}"
-            )
-
-            return schemas.GoogleCredentalData(**user_data.json())
-        except Exception:
-            # Invalid token
-            raise BadRequestException(detail="Incorrect google token")
-
-
 @router.post("/register_google", response_model=responses.LoginResponse)
 async def register_google_user(
     data: Annotated[schemas.GoogleRegister, Body(embed=True)],
     response: Response,
     db_session: DatabaseDependency,
+    http_client: HttpClientDependency,
 ) -> responses.LoginResponse:
-    user_exist = await user_service.user_exist_by_email(db_session, data.email)
-
-    if user_exist:
-        raise HTTPException(status_code=400, detail="Email has already registered")
-    
-    google_data = await fetch_google_data(data.google_token)
+    google_data = await fetch_google_data(http_client, data.google_token)
 
     created_user = await user_service.create_user_by_google_id(db_session, google_data, data)
 
+    if created_user is None:
+        raise HTTPException(status_code=400, detail="Email has already registered")
+
     tokens = create_and_inject_token(response, created_user)
 
     await db_session.commit()
@@ -81,37 +70,56 @@ async def register_google_user(
 
 
 
-async def handle_google_login(google_token: str, db_session: AsyncSession) -> schemas.UserResponse:
+async def handle_google_login(
+    google_token: str, db_session: AsyncSession, http_client: httpx.AsyncClient
+) -> schemas.UserResponse:
     """
     Handle login with google
     """
-    google_data = await fetch_google_data(google_token)
+    google_data = await fetch_google_data(http_client, google_token)
     user = await user_service.get_user_by_google_id(db_session, google_data.sub)
 
     return user
 
+async def check_password(
+    db_session: AsyncSession, email: str, plain_password: str, hashed_password: str | None
+):
+    """
+    Raise unless the password matches, and store a rehash of it when the stored
+    hash uses an outdated cost factor
+    """
+    if hashed_password is None:
+        raise BadRequestException(detail="Incorrect email or password")
+
+    valid, new_hash = await verify_and_update_password(plain_password, hashed_password)
+
+    if not valid:
+        raise BadRequestException(detail="Incorrect email or password")
+
+    if new_hash is not None:
+        await user_service.update_password_by_email(db_session, email, new_hash)
+
+
 @router.post("/login", response_model=responses.LoginResponse)
 async def login(
     data: Annotated[schemas.UserLogin, Body(embed=True)],
     response: Response,
     db_session: DatabaseDependency,
+    http_client: HttpClientDependency,
 ):
     print(data)
     if data.google_token is not None:
         # login with google
-        user = await handle_google_login(data.google_token, db_session)
+        user = await handle_google_login(data.google_token, db_session, http_client)
 
         if user is None:
             return responses.LoginResponse(has_account=False)
         
     if data.email is not None:
         # login with email
-        password = await user_service.user_password_by_email(db_session, data.email)
-
-        if password is None or not verify_password(data.password, password):
-            raise BadRequestException(detail="Incorrect email or password")
+        password, user = await user_service.user_login_by_email(db_session, data.email) or (None, None)
 
-        user = await user_service.user_detail_by_email(db_session, data.email)
+        await check_password(db_session, data.email, data.password, password)
 
     tokens = create_and_inject_token(response, user)
 
@@ -126,13 +134,32 @@ async def login(
     response: Response,
     db_session: DatabaseDependency,
 ):
-    password = await user_service.user_password_by_email(db_session, form_data.username)
+    password, user = await user_service.user_login_by_email(
+        db_session, form_data.username
+    ) or (None, None)
 
-    if not verify_password(form_data.password, password):
-        raise BadRequestException(detail="Incorrect email or password")
-
-    user = await user_service.user_detail_by_email(db_session, form_data.username)
+    await check_password(db_session, form_data.username, form_data.password, password)
 
     create_and_inject_token(response, user)
 
+    await db_session.commit()
+
     return {}
+
+
+@router.post("/logout")
+async def logout(token: Annotated[str, Depends(oauth2_scheme)], response: Response):
+    payload = decode_token(token)
+
+    if payload is not None and JTI in payload:
+        revoke_token(payload)
+
+    response.delete_cookie("access")
+    response.delete_cookie("refresh")
+
+    return {}
+
+
+@router.get("/hash_pool", response_model=responses.GenericResponse)
+async def password_hash_pool(current_user: UserDependency) -> responses.GenericResponse:
+    return responses.GenericResponse(data=hash_pool.stats())
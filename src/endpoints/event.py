@@ -1,16 +1,19 @@
 from typing import Annotated
-from fastapi import APIRouter, Body, Path, Query
+from fastapi import APIRouter, Body, Header, Path, Query
+from fastapi.responses import StreamingResponse
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.dependencies import UserDependency, DatabaseDependency
+from src.dependencies.database import SessionFactory
 
+from src.core.config import settings
 from src.exceptions import BadRequestException
 from src import schemas
 
 from src.schemas import responses
 
-from src.services import event, organization
+from src.services import event, event_cache, event_calendar, organization
 import datetime
 
 router = APIRouter(prefix="/event", tags=["Events"])
@@ -25,18 +28,108 @@ async def get_event(
     country: Annotated[int | None, Query()] = None,
     city: Annotated[int | None, Query()] = None,
     tags: Annotated[list[int] | None, Query()] = None,
+    tagMatch: Annotated[schemas.TagMatch, Query()] = schemas.TagMatch.ANY,
+    cursor: Annotated[str | None, Query()] = None,
+    estimateTotal: Annotated[bool, Query()] = False,
+    view: Annotated[schemas.EventView, Query()] = schemas.EventView.FULL,
+    if_none_match: Annotated[str | None, Header()] = None,
 ) -> responses.EventListResponse:
 
-    total, events = await event.get_all_event(
+    page_key = event_cache.page_key(
+        currentPage,
+        pageSize,
+        country=country,
+        city=city,
+        tags=tags,
+        tag_match=tagMatch,
+        cursor=cursor,
+        estimateTotal=estimateTotal,
+        view=view.value,
+    )
+    cached_page = event_cache.get_page(page_key)
+    if cached_page is not None:
+        body, etag = cached_page
+        if responses.etag_matches(if_none_match, etag):
+            return responses.not_modified(etag)
+        return responses.raw_response(body, headers={"ETag": etag})
+
+    total, events, next_cursor = await event.get_all_event(
         db_session,
         schemas.PaginationIn(currentPage=currentPage, pageSize=pageSize),
         country=country,
         city=city,
         tags=tags,
+        tag_match=tagMatch,
         start_after=datetime.datetime.now(),
+        cursor=cursor,
+        estimate_total=estimateTotal,
+        raw=True,
+        view=view,
     )
     page_response = schemas.PaginationResponse(total=total, currentPage=currentPage, pageSize=pageSize)
-    return responses.EventListResponse(data=events, page=page_response)
+    body = responses.render(
+        data=events, page=page_response.dict(), next_cursor=next_cursor
+    )
+    etag = responses.body_etag(body)
+    event_cache.set_page(page_key, body, etag)
+
+    if responses.etag_matches(if_none_match, etag):
+        return responses.not_modified(etag)
+    return responses.raw_response(body, headers={"ETag": etag})
+
+
+@router.get("/calendar", response_model=responses.EventCalendarResponse)
+async def get_event_calendar(
+    current_user: UserDependency,
+    db_session: DatabaseDependency,
+    year: Annotated[int, Query(ge=1, le=9999)],
+    month: Annotated[int, Query(ge=1, le=12)],
+    country: Annotated[int | None, Query()] = None,
+    city: Annotated[int | None, Query()] = None,
+    tag: Annotated[int | None, Query()] = None,
+) -> responses.EventCalendarResponse:
+
+    days = await event_calendar.event_calendar(
+        db_session, year, month, country=country, city=city, tag=tag
+    )
+
+    return responses.EventCalendarResponse(data=days)
+
+
+@router.get("/facets", response_model=responses.EventFacetResponse)
+async def get_event_facets(
+    current_user: UserDependency,
+    db_session: DatabaseDependency,
+    country: Annotated[int | None, Query()] = None,
+    city: Annotated[int | None, Query()] = None,
+    tags: Annotated[list[int] | None, Query()] = None,
+    tagMatch: Annotated[schemas.TagMatch, Query()] = schemas.TagMatch.ANY,
+    if_none_match: Annotated[str | None, Header()] = None,
+) -> responses.EventFacetResponse:
+
+    facet_key = event_cache.facet_key(
+        country=country, city=city, tags=tags, tag_match=tagMatch
+    )
+    cached_facets = event_cache.get_page(facet_key)
+
+    if cached_facets is not None:
+        body, etag = cached_facets
+    else:
+        facets = await event.event_facets(
+            db_session,
+            country=country,
+            city=city,
+            tags=tags,
+            tag_match=tagMatch,
+            start_after=datetime.datetime.now(),
+        )
+        body = responses.render(data=facets)
+        etag = responses.body_etag(body)
+        event_cache.set_page(facet_key, body, etag)
+
+    if responses.etag_matches(if_none_match, etag):
+        return responses.not_modified(etag)
+    return responses.raw_response(body, headers={"ETag": etag})
 
 
 @router.post("/", response_model=responses.EventAttributeResponse)
@@ -56,15 +149,159 @@ async def create_event(
     return responses.EventAttributeResponse(data=new_event)
 
 
+@router.post("/bulk", response_model=responses.EventBulkResponse)
+async def create_events(
+    current_user: UserDependency,
+    db_session: DatabaseDependency,
+    data: Annotated[list[schemas.EventAttributeIn], Body(embed=True)],
+) -> responses.EventBulkResponse:
+
+    if current_user.organization_id is None:
+        raise BadRequestException("You must be in an organization to create an event")
+    if not data:
+        raise BadRequestException("No event to create")
+    if len(data) > settings.EVENT_BULK_MAX_SIZE:
+        raise BadRequestException(
+            f"At most {settings.EVENT_BULK_MAX_SIZE} events can be created at once"
+        )
+
+    events_data = [
+        schemas.EventAttributeMid(
+            organizer_id=current_user.organization_id, **event_data.dict()
+        )
+        for event_data in data
+    ]
+    new_events = await event.create_new_events(db_session, events_data)
+    await db_session.commit()
+    return responses.EventBulkResponse(data=new_events)
+
+
+@router.get("/search", response_model=responses.EventListResponse)
+async def search_event(
+    current_user: UserDependency,
+    db_session: DatabaseDependency,
+    q: Annotated[str, Query(min_length=1)],
+    currentPage: Annotated[int, Query(gt=0)] = 1,
+    pageSize: Annotated[int, Query(lt=100)] = 6,
+    country: Annotated[int | None, Query()] = None,
+    city: Annotated[int | None, Query()] = None,
+    tags: Annotated[list[int] | None, Query()] = None,
+    tagMatch: Annotated[schemas.TagMatch, Query()] = schemas.TagMatch.ANY,
+) -> responses.EventListResponse:
+
+    total, events = await event.search_event(
+        db_session,
+        q,
+        schemas.PaginationIn(currentPage=currentPage, pageSize=pageSize),
+        country=country,
+        city=city,
+        tags=tags,
+        tag_match=tagMatch,
+        start_after=datetime.datetime.now(),
+        raw=True,
+    )
+    page_response = schemas.PaginationResponse(total=total, currentPage=currentPage, pageSize=pageSize)
+    return responses.raw_response(
+        responses.render(data=events, page=page_response.dict(), next_cursor=None)
+    )
+
+
+@router.get("/nearby", response_model=responses.EventNearbyResponse)
+async def get_nearby_event(
+    current_user: UserDependency,
+    db_session: DatabaseDependency,
+    lat: Annotated[float, Query(ge=-90, le=90)],
+    lon: Annotated[float, Query(ge=-180, le=180)],
+    radius_km: Annotated[float, Query(gt=0, le=500)] = 25,
+    pageSize: Annotated[int, Query(gt=0, lt=100)] = 20,
+    tags: Annotated[list[int] | None, Query()] = None,
+    tagMatch: Annotated[schemas.TagMatch, Query()] = schemas.TagMatch.ANY,
+) -> responses.EventNearbyResponse:
+
+    events = await event.nearby_events(
+        db_session,
+        lat,
+        lon,
+        radius_km,
+        pageSize,
+        tags=tags,
+        tag_match=tagMatch,
+        start_after=datetime.datetime.now(),
+        raw=True,
+    )
+    return responses.raw_response(responses.render(data=events))
+
+
+@router.get("/export")
+async def export_event(
+    current_user: UserDependency,
+    format: Annotated[schemas.ExportFormat, Query()] = schemas.ExportFormat.NDJSON,
+) -> StreamingResponse:
+
+    async def export_chunks():
+        # The request session is closed before the body is sent, the stream
+        # gets a session of its own for the server side cursor
+        async with SessionFactory() as export_session:
+            async for chunk in event.export_events(export_session, format):
+                yield chunk
+
+    media_type = {
+        schemas.ExportFormat.NDJSON: "application/x-ndjson",
+        schemas.ExportFormat.CSV: "text/csv",
+    }[format]
+
+    return StreamingResponse(
+        export_chunks(),
+        media_type=media_type,
+        headers={
+            "Content-Disposition": f'attachment; filename="events.{format.value}"'
+        },
+    )
+
+
+@router.get("/batch", response_model=responses.EventBatchResponse)
+async def get_event_batch(
+    current_user: UserDependency,
+    db_session: DatabaseDependency,
+    ids: Annotated[list[int], Query()],
+) -> responses.EventBatchResponse:
+
+    # Deduplicated once, the limit, data and missing all see the same ids
+    ids = list(dict.fromkeys(ids))
+
+    if len(ids) > settings.EVENT_BATCH_MAX_SIZE:
+        raise BadRequestException(
+            f"At most {settings.EVENT_BATCH_MAX_SIZE} events can be fetched at once"
+        )
+
+    found_events = await event.get_events_by_ids(db_session, ids, raw=True)
+
+    found_ids = {found_event["id"] for found_event in found_events}
+    missing = [id for id in ids if id not in found_ids]
+
+    return responses.raw_response(responses.render(data=found_events, missing=missing))
+
+
 @router.get("/{event_id}", response_model=responses.EventAttributeResponse)
 async def get_event(
     current_user: UserDependency,
     db_session: DatabaseDependency,
     event_id: Annotated[int, Path],
+    if_none_match: Annotated[str | None, Header()] = None,
 ) -> responses.EventAttributeResponse:
 
-    retrieved_event = await event.get_event_by_id(db_session, event_id)
-    return responses.EventAttributeResponse(data=retrieved_event)
+    if if_none_match is not None:
+        # A version lookup is enough to tell whether the client copy is current
+        version = await event.get_event_version(db_session, event_id)
+        etag = event.event_etag(event_id, version)
+        if responses.etag_matches(if_none_match, etag):
+            return responses.not_modified(etag)
+
+    retrieved_event = await event.get_event_by_id(db_session, event_id, raw=True)
+    etag = event.event_etag(event_id, retrieved_event["version"])
+    return responses.raw_response(
+        responses.render(data=retrieved_event), headers={"ETag": etag}
+    )
 
 
 @router.put("/{event_id}", response_model=responses.EventAttributeResponse)
@@ -83,3 +320,22 @@ async def get_event(
     retrieved_event = await event.update_event(db_session, event_id, event_data)
     await db_session.commit()
     return responses.EventAttributeResponse(data=retrieved_event)
+
+
+
+@router.patch("/{event_id}", response_model=responses.EventAttributeResponse)
+async def patch_event(
+    current_user: UserDependency,
+    db_session: DatabaseDependency,
+    event_id: Annotated[int, Path],
+    event_data: Annotated[schemas.EventAttributePatch, Body(embed=True)],
+) -> responses.EventAttributeResponse:
+
+    event_organizer_id = await event.get_organizer_by_id(db_session, event_id)
+
+    if current_user.organization_id != event_organizer_id:
+        raise BadRequestException("User are not the organizer of the event")
+
+    retrieved_event = await event.patch_event(db_session, event_id, event_data)
+    await db_session.commit()
+    return responses.EventAttributeResponse(data=retrieved_event)
@@ -1,48 +1,75 @@
-from fastapi import APIRouter, Path
+from fastapi import APIRouter, Header, Path, Query, Response
 
-from src import schemas
+from src.core.config import settings
 from src.schemas import responses
 from src.dependencies import DatabaseDependency
-from src.services import metadata
+from src.services import metadata_cache
 from typing import Annotated
 
 router = APIRouter(prefix="/metadata", tags=["Metadata"])
 
 
+def metadata_response(payload: tuple[bytes, str], if_none_match: str | None) -> Response:
+    """
+    Send a pre-rendered metadata body, or a 304 when the client has it already
+    """
+    body, etag = payload
+    cache_control = f"public, max-age={settings.METADATA_MAX_AGE_SECONDS}"
+
+    if responses.etag_matches(if_none_match, etag):
+        response = responses.not_modified(etag)
+        response.headers["Cache-Control"] = cache_control
+        return response
+
+    return responses.raw_response(
+        body, headers={"ETag": etag, "Cache-Control": cache_control}
+    )
+
+
 @router.get("/user")
-async def user_metadata(db_session: DatabaseDependency):
-    countries = await metadata.all_countries(db_session)
-    return responses.GenericResponse(
-        data={
-            "gender": [
-                {"label": gender_value.capitalize(), "value": gender_value}
-                for gender_value in schemas.Gender._member_names_
-            ],
-            "countries": countries,
-        }
+async def user_metadata(
+    db_session: DatabaseDependency,
+    if_none_match: Annotated[str | None, Header()] = None,
+):
+    snapshot = await metadata_cache.get_snapshot(db_session)
+
+    return metadata_response(snapshot.payload("user"), if_none_match)
+
+
+@router.get("/cities/search")
+async def search_cities(
+    db_session: DatabaseDependency,
+    q: Annotated[str, Query(min_length=1, max_length=100)],
+    country: Annotated[int | None, Query()] = None,
+    limit: Annotated[int, Query(gt=0, le=50)] = 10,
+):
+    snapshot = await metadata_cache.get_snapshot(db_session)
+
+    cities = snapshot.city_index.search(q, country=country, limit=limit)
+
+    return responses.raw_response(
+        responses.render(data={"cities": [city._asdict() for city in cities]})
     )
 
 
 @router.get("/cities/{country_id}")
 async def citie_of_countries(
-    db_session: DatabaseDependency, country_id: Annotated[int, Path()]
+    db_session: DatabaseDependency,
+    country_id: Annotated[int, Path()],
+    if_none_match: Annotated[str | None, Header()] = None,
 ):
-    cities = await metadata.cities_of_countries(db_session, country_id)
+    snapshot = await metadata_cache.get_snapshot(db_session)
 
-    return responses.GenericResponse(data={"cities": cities})
+    return metadata_response(
+        snapshot.payload(metadata_cache.cities_payload(country_id)), if_none_match
+    )
 
 
 @router.get("/org")
-async def org_metadata(db_session: DatabaseDependency):
-    tags = await metadata.all_tags(db_session)
-    countries = await metadata.all_countries(db_session)
-    return responses.GenericResponse(
-        data={
-            "company_size": [
-                {"label": org_size.capitalize(), "value": org_size}
-                for org_size in schemas.OrganizationSize._member_names_
-            ],
-            "tags": tags,
-            "countries": countries,
-        }
-    )
\ No newline at end of file
+async def org_metadata(
+    db_session: DatabaseDependency,
+    if_none_match: Annotated[str | None, Header()] = None,
+):
+    snapshot = await metadata_cache.get_snapshot(db_session)
+
+    return metadata_response(snapshot.payload("org"), if_none_match)
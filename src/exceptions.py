@@ -42,3 +42,12 @@ class ForbiddenException(HTTPException):
             status_code=status.HTTP_403_FORBIDDEN,
             detail=detail if detail else "Forbidden",
         )
+
+
+class ServiceUnavailableException(HTTPException):
+    def __init__(self, detail: Any = None) -> None:
+        super().__init__(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=detail if detail else "Service unavailable",
+            headers={"Retry-After": "1"},
+        )
@@ -1,6 +1,6 @@
 from typing import Any
-from pydantic import BaseModel, PositiveInt, validator, EmailStr, root_validator, Field
-from datetime import datetime
+from pydantic import BaseModel, NonNegativeInt, validator, EmailStr, root_validator, Field
+from datetime import date, datetime
 import enum
 
 
@@ -44,6 +44,21 @@ class EventStatus(enum.Enum):
     PUBLIC = "PUBLIC"
 
 
+class TagMatch(enum.Enum):
+    ANY = "any"
+    ALL = "all"
+
+
+class EventView(enum.Enum):
+    FULL = "full"
+    SUMMARY = "summary"
+
+
+class ExportFormat(enum.Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
 class OrganizationSize(enum.Enum):
     LARGE = "LARGE"
     MEDIUM = "MEDIUM"
@@ -183,7 +198,7 @@ class PaginationIn(BaseModel):
 
 
 class PaginationResponse(PaginationIn):
-    total: PositiveInt
+    total: NonNegativeInt
 
 
 class EventListQuery(BaseModel):
@@ -225,17 +240,71 @@ class EventAttributeIn(BaseModel):
     country: int
 
 
+class EventAttributePatch(BaseModel):
+    event_name: str | None
+    street_addr: str | None
+    description: str | None
+    tags: list[int] | None
+    phone_contact: str | None
+    pictures: EventImage | None
+    details: EventDetailSchema | None
+    status: EventStatus | None
+    start_date: datetime | None
+    end_date: datetime | None
+    city: int | None
+    country: int | None
+
+    @validator("*", pre=True)
+    def reject_null(cls, v, field):
+        if v is None:
+            raise ValueError(f"{field.name} cannot be null, leave it out to keep it")
+
+        return v
+
+
 class EventAttributeMid(EventAttributeIn):
     organizer_id: int
 
 
 class EventAttribute(EventAttributeMid):
     id: int
+    version: int
     organizer: str
     city: str
     country: str
     tags: list[Tag] | None
 
 
+class EventSummary(BaseModel):
+    id: int
+    event_name: str
+    start_date: datetime
+    end_date: datetime
+    city: str
+    banner: str | None
+    tags: list[Tag] | None
+
+
+class FacetCount(BaseModel):
+    value: int
+    label: str
+    count: int
+
+
+class EventNearby(EventAttribute):
+    distance_km: float
+
+
+class CalendarDay(BaseModel):
+    day: date
+    count: NonNegativeInt
+
+
+class EventFacets(BaseModel):
+    countries: list[FacetCount]
+    cities: list[FacetCount]
+    tags: list[FacetCount]
+
+
 class PaginationEventList(BaseModel):
     data: list[EventAttribute] = []
@@ -1,5 +1,8 @@
 from pydantic import BaseModel
+from fastapi import Response, status
 from src import schemas
+import hashlib
+import orjson
 import typing
 
 class BaseResponse(BaseModel):
@@ -20,10 +23,67 @@ class MembershipResponse(BaseResponse):
     data: schemas.Membership
 
 class EventListResponse(BaseResponse):
-    data: list[schemas.EventAttribute]
+    data: list[schemas.EventAttribute] | list[schemas.EventSummary]
     page: schemas.PaginationResponse
+    next_cursor: str | None
 
 class EventAttributeResponse(BaseResponse):
     data: schemas.EventAttribute
+
+class EventBulkResponse(BaseResponse):
+    data: list[schemas.EventAttribute]
+
+class EventFacetResponse(BaseResponse):
+    data: schemas.EventFacets
+
+class EventNearbyResponse(BaseResponse):
+    data: list[schemas.EventNearby]
+
+class EventCalendarResponse(BaseResponse):
+    data: list[schemas.CalendarDay]
+
+class EventBatchResponse(BaseResponse):
+    data: list[schemas.EventAttribute]
+    missing: list[int]
     
 
+
+
+
+def render(**content: typing.Any) -> bytes:
+    """
+    Serialize a BaseResponse shaped body straight from orjson-ready data,
+    for routes that skip the response models
+    """
+    return orjson.dumps({"success": True, **content})
+
+
+def raw_response(body: bytes, **kwargs: typing.Any) -> Response:
+    return Response(content=body, media_type="application/json", **kwargs)
+
+
+def body_etag(body: bytes) -> str:
+    return f'W/"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+
+def strong_etag(body: bytes) -> str:
+    return f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """
+    Weak comparison of an If-None-Match header against an ETag
+    """
+    if if_none_match is None:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+
+    def opaque(tag: str) -> str:
+        return tag.strip().removeprefix("W/")
+
+    return opaque(etag) in {opaque(tag) for tag in if_none_match.split(",")}
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
@@ -0,0 +1,96 @@
+from src import schemas
+
+from bisect import bisect_left
+from typing import NamedTuple
+import unicodedata
+
+
+# Letters NFKD does not split into a base letter and a mark
+_UNDECOMPOSED = str.maketrans({"đ": "d", "Đ": "D", "ø": "o", "Ø": "O", "ł": "l", "Ł": "L"})
+
+
+def normalize_name(name: str) -> str:
+    """
+    Case and accent insensitive form of a place name, "Đà Nẵng" -> "da nang"
+    """
+    decomposed = unicodedata.normalize("NFKD", name.translate(_UNDECOMPOSED))
+    stripped = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return " ".join(stripped.casefold().split())
+
+
+class CityMatch(NamedTuple):
+    value: int
+    label: str
+    country: int
+
+
+class _PrefixIndex:
+    """
+    Sorted normalized keys, the keys starting with a prefix are one
+    contiguous run found by bisect
+    """
+
+    def __init__(self, entries: list[tuple[str, CityMatch]]):
+        entries.sort(key=lambda entry: (entry[0], entry[1].value))
+        self._keys = [key for key, _ in entries]
+        self._cities = [city for _, city in entries]
+
+    def search(self, prefix: str, limit: int) -> list[CityMatch]:
+        found = {}
+        position = bisect_left(self._keys, prefix)
+
+        while (
+            len(found) < limit
+            and position < len(self._keys)
+            and self._keys[position].startswith(prefix)
+        ):
+            city = self._cities[position]
+            found.setdefault(city.value, city)
+            position += 1
+
+        return list(found.values())
+
+
+class CityIndex:
+    """
+    Prefix search over city names. Every word of a name is indexed, so
+    "minh" finds "Ho Chi Minh" as well as names starting with it.
+    """
+
+    def __init__(self, cities: dict[int, list[schemas.City]]):
+        by_country: dict[int, list[tuple[str, CityMatch]]] = {}
+        self._exact: dict[tuple[int, str], CityMatch] = {}
+
+        for country_id, country_cities in cities.items():
+            entries = by_country.setdefault(country_id, [])
+
+            for city in country_cities:
+                match = CityMatch(value=city.value, label=city.label, country=country_id)
+                name = normalize_name(city.label)
+                self._exact.setdefault((country_id, name), match)
+
+                words = name.split(" ")
+                for start in range(len(words)):
+                    entries.append((" ".join(words[start:]), match))
+
+        self._all = _PrefixIndex([entry for entries in by_country.values() for entry in entries])
+        self._by_country = {
+            country_id: _PrefixIndex(entries) for country_id, entries in by_country.items()
+        }
+
+    def search(self, query: str, country: int | None = None, limit: int = 10) -> list[CityMatch]:
+        prefix = normalize_name(query)
+        if not prefix:
+            return []
+
+        if country is None:
+            return self._all.search(prefix, limit)
+
+        index = self._by_country.get(country)
+        return index.search(prefix, limit) if index is not None else []
+
+    def find(self, name: str, country: int) -> CityMatch | None:
+        """
+        City of a country whose name matches exactly, up to case and accents
+        """
+        return self._exact.get((country, normalize_name(name)))
@@ -5,12 +5,88 @@ from sqlalchemy.ext.asyncio import (
     AsyncSession,
 )
 
-from sqlalchemy import select, update, func
+from sqlalchemy import (
+    select,
+    update,
+    delete,
+    func,
+    all_,
+    bindparam,
+    literal,
+    literal_column,
+    column,
+    true,
+    tuple_,
+    Integer,
+    String,
+)
 
 from sqlalchemy.dialects.postgresql import insert as pg_insert
-from sqlalchemy.dialects.postgresql import array_agg
+from sqlalchemy.dialects.postgresql import (
+    ARRAY,
+    TIMESTAMP,
+    aggregate_order_by,
+    array_agg,
+)
 from src import exceptions
+from src.core.config import settings
+from src.services import event_cache, event_calendar, event_count, event_filters
+from typing import AsyncIterator
+import base64
+import binascii
+import csv
 import datetime
+import enum
+import functools
+import io
+import orjson
+
+
+EVENT_FIELDS = tuple(schemas.EventAttribute.__fields__)
+
+# Patched fields that move an event between calendar cells
+CALENDAR_FIELDS = frozenset({"status", "start_date", "country", "city", "tags"})
+
+_VIEW_MODELS = {
+    schemas.EventView.FULL: schemas.EventAttribute,
+    schemas.EventView.SUMMARY: schemas.EventSummary,
+}
+
+
+def event_from_row(
+    row, raw: bool = False, view: schemas.EventView = schemas.EventView.FULL
+) -> schemas.EventAttribute | schemas.EventSummary | dict:
+    """
+    Turn an event_listing row into the model of the given view.
+
+    raw=True skips the pydantic models and returns a dict orjson can dump as
+    is. event_listing only holds data validated by EventAttributeIn when it
+    was written, so read routes use it to avoid validating every row again.
+    """
+    model = _VIEW_MODELS[view]
+    mapping = row._mapping
+
+    if raw:
+        return {field: mapping[field] for field in model.__fields__}
+
+    return model(**mapping)
+
+
+def encode_event_cursor(start_date: datetime.datetime, event_id: int) -> str:
+    """
+    Build the opaque keyset cursor pointing right after the given event
+    """
+    raw = orjson.dumps([start_date.isoformat(), event_id])
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_event_cursor(cursor: str) -> tuple[datetime.datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        start_date, event_id = orjson.loads(raw)
+        return datetime.datetime.fromisoformat(start_date), int(event_id)
+    except (binascii.Error, orjson.JSONDecodeError, TypeError, ValueError):
+        raise exceptions.BadRequestException("Invalid cursor")
 
 
 async def get_all_event(
@@ -19,37 +95,450 @@ async def get_all_event(
     city: int | None = None,
     country: int | None = None,
     tags: list[int] | None = None,
+    tag_match: schemas.TagMatch = schemas.TagMatch.ANY,
     start_after: datetime.datetime | None = None,
-) -> list[schemas.EventAttribute]:
+    cursor: str | None = None,
+    estimate_total: bool = False,
+    raw: bool = False,
+    view: schemas.EventView = schemas.EventView.FULL,
+) -> tuple[int, list[schemas.EventAttribute | schemas.EventSummary | dict], str | None]:
+    """
+    Return one page of events ordered by (start_date, id).
+
+    When a cursor is given the page starts right after the event it points to
+    (keyset pagination), otherwise currentPage is used with LIMIT/OFFSET.
+    The total counts every event matching the filters, see event_count.
+    """
+
+    query, params = event_statement(
+        EventQueryMode.CURSOR if cursor is not None else EventQueryMode.PAGE,
+        tag_match=tag_match,
+        view=view,
+        city=city,
+        country=country,
+        tags=tags,
+        start_after=start_after,
+    )
 
-    event_tbl = db_tables.events
+    if cursor is not None:
+        params["cursor_start_date"], params["cursor_id"] = decode_event_cursor(cursor)
+    else:
+        params["offset"] = page_config.pageSize * (page_config.currentPage-1)
+
+    # One extra row tells whether there is a next page
+    params["limit"] = page_config.pageSize + 1
+
+    all_events = (await db_session.execute(query, params)).all()
+
+    next_cursor = None
+    if len(all_events) > page_config.pageSize:
+        all_events = all_events[: page_config.pageSize]
+        last_event = all_events[-1]
+        next_cursor = encode_event_cursor(last_event.start_date, last_event.id)
+
+    total = await event_count.count_events(
+        db_session,
+        city=city,
+        country=country,
+        tags=tags,
+        tag_match=tag_match,
+        start_after=start_after,
+        estimated=estimate_total,
+    )
+    return (
+        total,
+        [event_from_row(event, raw, view) for event in all_events],
+        next_cursor,
+    )
 
-    query = build_event_select_query(city=city, country=country, tags=tags, start_after=start_after)
 
-    offset = page_config.pageSize * (page_config.currentPage-1)
-    query = query.limit(page_config.pageSize).offset(offset)
+def build_event_select_query(
+    city: int | None = None,
+    country: int | None = None,
+    tags: list[int] | None = None,
+    tag_match: schemas.TagMatch = schemas.TagMatch.ANY,
+    start_after: datetime.datetime | None = None,
+    org_id: int | None = None,
+    event_id: int | None = None,
+    event_ids: list[int] | None = None,
+    search: str | None = None,
+    view: schemas.EventView = schemas.EventView.FULL,
+):
+    listing_tbl = db_tables.event_listing
+
+    if view == schemas.EventView.SUMMARY:
+        # Only what an event card shows, the banner is picked out of the
+        # pictures document so the rest of it never leaves the database
+        columns = (
+            listing_tbl.c.id,
+            listing_tbl.c.event_name,
+            listing_tbl.c.start_date,
+            listing_tbl.c.end_date,
+            listing_tbl.c.city,
+            listing_tbl.c.pictures[("banner", 0, "url")].astext.label("banner"),
+            listing_tbl.c.tags,
+        )
+    else:
+        columns = (
+            listing_tbl.c.id,
+            listing_tbl.c.organizer_id,
+            listing_tbl.c.event_name,
+            listing_tbl.c.street_addr,
+            listing_tbl.c.description,
+            listing_tbl.c.phone_contact,
+            listing_tbl.c.pictures,
+            listing_tbl.c.details,
+            listing_tbl.c.status,
+            listing_tbl.c.start_date,
+            listing_tbl.c.end_date,
+            listing_tbl.c.version,
+            listing_tbl.c.organizer,
+            listing_tbl.c.country,
+            listing_tbl.c.city,
+            listing_tbl.c.tags,
+        )
 
-    all_events = (await db_session.execute(query)).all()
+    query = select(*columns).where(
+        *event_filters.listing_filters(
+            city=city,
+            country=country,
+            tags=tags,
+            tag_match=tag_match,
+            start_after=start_after,
+            org_id=org_id,
+            event_id=event_id,
+            event_ids=event_ids,
+            search=search,
+        )
+    )
 
-    query = select(func.count()).select_from(event_tbl)
-    total = (await db_session.execute(query)).scalar()
-    return total, [schemas.EventAttribute(**event._mapping) for event in all_events]
+    return query
 
 
-def build_event_select_query(
+async def search_event(
+    db_session: AsyncSession,
+    search: str,
+    page_config: schemas.PaginationIn,
     city: int | None = None,
     country: int | None = None,
     tags: list[int] | None = None,
+    tag_match: schemas.TagMatch = schemas.TagMatch.ANY,
     start_after: datetime.datetime | None = None,
-    org_id: int | None = None,
-    event_id: int | None = None,
+    raw: bool = False,
+) -> tuple[int, list[schemas.EventAttribute | dict]]:
+    """
+    Full text search over event name and description, best matches first
+    """
+    query, params = event_statement(
+        EventQueryMode.SEARCH,
+        tag_match=tag_match,
+        city=city,
+        country=country,
+        tags=tags,
+        start_after=start_after,
+        search=search,
+    )
+    params["limit"] = page_config.pageSize
+    params["offset"] = page_config.pageSize * (page_config.currentPage - 1)
+
+    found_events = (await db_session.execute(query, params)).all()
+
+    if found_events:
+        total = found_events[0].total
+    elif params["offset"]:
+        # Past the last page no row carries the window count, count on its own
+        count_query = (
+            select(func.count())
+            .select_from(db_tables.event_listing)
+            .where(
+                *event_filters.listing_filters(
+                    city=city,
+                    country=country,
+                    tags=tags or None,
+                    tag_match=tag_match,
+                    start_after=start_after,
+                    search=search,
+                )
+            )
+        )
+        total = (await db_session.execute(count_query)).scalar()
+    else:
+        total = 0
+
+    return total, [event_from_row(event, raw) for event in found_events]
+
+
+async def nearby_events(
+    db_session: AsyncSession,
+    latitude: float,
+    longitude: float,
+    radius_km: float,
+    limit: int,
+    tags: list[int] | None = None,
+    tag_match: schemas.TagMatch = schemas.TagMatch.ANY,
+    start_after: datetime.datetime | None = None,
+    raw: bool = False,
+) -> list[schemas.EventNearby | dict]:
+    """
+    Events within radius_km of a point, closest first. The bounding box
+    narrows the rows down on the index, the exact distance is only computed
+    for what is left in it.
+    """
+    listing_tbl = db_tables.event_listing
+
+    distance = event_filters.distance_km(latitude, longitude)
+    distance_col = distance.label("distance_km")
+
+    query = (
+        build_event_select_query(tags=tags or None, tag_match=tag_match, start_after=start_after)
+        .add_columns(distance_col)
+        .where(
+            *event_filters.bounding_box_filter(latitude, longitude, radius_km),
+            distance <= radius_km,
+        )
+        .order_by(distance_col, listing_tbl.c.id)
+        .limit(limit)
+    )
+
+    nearby = []
+    for row in (await db_session.execute(query)).all():
+        found_event = event_from_row(row, raw=True)
+        found_event["distance_km"] = row.distance_km
+        nearby.append(found_event if raw else schemas.EventNearby(**found_event))
+
+    return nearby
+
+
+async def event_facets(
+    db_session: AsyncSession,
+    city: int | None = None,
+    country: int | None = None,
+    tags: list[int] | None = None,
+    tag_match: schemas.TagMatch = schemas.TagMatch.ANY,
+    start_after: datetime.datetime | None = None,
+) -> dict[str, list[dict]]:
+    """
+    Number of events per country, city and tag among the events matching the
+    filters, all three computed by one GROUPING SETS query
+    """
+    listing_tbl = db_tables.event_listing
+
+    tag_tbl = (
+        func.jsonb_to_recordset(listing_tbl.c.tags)
+        .table_valued(column("value", Integer), column("label", String))
+        .render_derived(name="tag", with_types=True)
+        .lateral()
+    )
+
+    query = (
+        select(
+            listing_tbl.c.country_id,
+            listing_tbl.c.country,
+            listing_tbl.c.city_id,
+            listing_tbl.c.city,
+            tag_tbl.c.value.label("tag_id"),
+            tag_tbl.c.label.label("tag"),
+            func.count(listing_tbl.c.id.distinct()).label("count"),
+        )
+        .select_from(listing_tbl.join(tag_tbl, true(), isouter=True))
+        .where(
+            *event_filters.listing_filters(
+                city=city,
+                country=country,
+                tags=tags or None,
+                tag_match=tag_match,
+                start_after=start_after,
+            )
+        )
+        .group_by(
+            func.grouping_sets(
+                tuple_(listing_tbl.c.country_id, listing_tbl.c.country),
+                tuple_(listing_tbl.c.city_id, listing_tbl.c.city),
+                tuple_(tag_tbl.c.value, tag_tbl.c.label),
+            )
+        )
+    )
+
+    facets = {"countries": [], "cities": [], "tags": []}
+
+    for row in await db_session.execute(query):
+        if row.country_id is not None:
+            facets["countries"].append(
+                {"value": row.country_id, "label": row.country, "count": row.count}
+            )
+        elif row.city_id is not None:
+            facets["cities"].append(
+                {"value": row.city_id, "label": row.city, "count": row.count}
+            )
+        elif row.tag_id is not None:
+            # Untagged events land in a null tag group, skip it
+            facets["tags"].append(
+                {"value": row.tag_id, "label": row.tag, "count": row.count}
+            )
+
+    for facet in facets.values():
+        facet.sort(key=lambda entry: (-entry["count"], entry["label"]))
+
+    return facets
+
+
+def _csv_value(value):
+    if value is None:
+        return ""
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, datetime.datetime):
+        return value.isoformat()
+    if isinstance(value, (dict, list)):
+        return orjson.dumps(value).decode()
+    return value
+
+
+async def export_events(
+    db_session: AsyncSession, export_format: schemas.ExportFormat
+) -> AsyncIterator[bytes]:
+    """
+    Stream every public event as NDJSON lines or CSV rows.
+
+    Rows come from a server side cursor a partition at a time, so memory
+    stays flat whatever the size of the catalog.
+    """
+    listing_tbl = db_tables.event_listing
+
+    query = (
+        build_event_select_query()
+        .where(listing_tbl.c.status == schemas.EventStatus.PUBLIC)
+        .order_by(listing_tbl.c.id)
+        .execution_options(yield_per=settings.EVENT_EXPORT_BATCH_SIZE)
+    )
+
+    result = await db_session.stream(query)
+
+    if export_format == schemas.ExportFormat.CSV:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(EVENT_FIELDS)
+
+        async for rows in result.partitions():
+            for row in rows:
+                writer.writerow(_csv_value(row._mapping[field]) for field in EVENT_FIELDS)
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+
+        yield buffer.getvalue().encode()
+        return
+
+    async for rows in result.partitions():
+        yield b"".join(orjson.dumps(event_from_row(row, raw=True)) + b"\n" for row in rows)
+
+
+class EventQueryMode(enum.Enum):
+    SINGLE = "single"
+    PAGE = "page"
+    CURSOR = "cursor"
+    SEARCH = "search"
+
+
+_EVENT_FILTER_TYPES = {
+    "city": Integer(),
+    "country": Integer(),
+    "tags": ARRAY(Integer),
+    "start_after": TIMESTAMP(timezone=True),
+    "org_id": Integer(),
+    "event_id": Integer(),
+    "event_ids": ARRAY(Integer),
+    "search": String(),
+}
+
+
+@functools.lru_cache(maxsize=None)
+def _cached_event_statement(
+    filter_names: frozenset[str],
+    tag_match: schemas.TagMatch,
+    mode: EventQueryMode,
+    view: schemas.EventView,
 ):
+    """
+    Build the statement of one filter shape with every value left as a bound
+    parameter. Shapes are few so each one is built, and compiled by the
+    engine, only once per process.
+    """
+    listing_tbl = db_tables.event_listing
+
+    filter_params = {
+        name: bindparam(name, type_=_EVENT_FILTER_TYPES[name]) for name in filter_names
+    }
+    query = build_event_select_query(tag_match=tag_match, view=view, **filter_params)
+
+    if mode == EventQueryMode.PAGE:
+        query = (
+            query.order_by(listing_tbl.c.start_date, listing_tbl.c.id)
+            .limit(bindparam("limit", type_=Integer))
+            .offset(bindparam("offset", type_=Integer))
+        )
+
+    elif mode == EventQueryMode.CURSOR:
+        query = (
+            query.where(
+                tuple_(listing_tbl.c.start_date, listing_tbl.c.id)
+                > tuple_(
+                    bindparam("cursor_start_date", type_=TIMESTAMP(timezone=True)),
+                    bindparam("cursor_id", type_=Integer),
+                )
+            )
+            .order_by(listing_tbl.c.start_date, listing_tbl.c.id)
+            .limit(bindparam("limit", type_=Integer))
+        )
+
+    elif mode == EventQueryMode.SEARCH:
+        rank = func.ts_rank_cd(
+            listing_tbl.c.search_vector,
+            event_filters.search_query(filter_params["search"]),
+        )
+        query = (
+            query.add_columns(func.count().over().label("total"))
+            .order_by(rank.desc(), listing_tbl.c.id)
+            .limit(bindparam("limit", type_=Integer))
+            .offset(bindparam("offset", type_=Integer))
+        )
+
+    return query
+
+
+def event_statement(
+    mode: EventQueryMode = EventQueryMode.SINGLE,
+    tag_match: schemas.TagMatch = schemas.TagMatch.ANY,
+    view: schemas.EventView = schemas.EventView.FULL,
+    **filters,
+) -> tuple:
+    """
+    Cached statement for the given filters plus the parameters to execute it
+    with. PAGE and SEARCH also need limit/offset, CURSOR needs limit,
+    cursor_start_date and cursor_id.
+    """
+    params = {
+        name: value for name, value in filters.items() if value is not None and value != []
+    }
+
+    if "tags" not in params:
+        tag_match = schemas.TagMatch.ANY
+
+    return _cached_event_statement(frozenset(params), tag_match, mode, view), params
+
+
+def build_event_listing_upsert_query(event_ids: list[int] | None = None):
+    """
+    INSERT ... SELECT the joined event rows into event_listing, replacing the
+    rows already there. Every event is rebuilt when event_ids is None.
+    """
     event_tbl = db_tables.events
     org_tbl = db_tables.organizations
     tag_tbl = db_tables.tags
     event_tag_tbl = db_tables.event_tag
     country_tbl = db_tables.countries
     city_tbl = db_tables.cities
+    listing_tbl = db_tables.event_listing
 
     join_stmt = (
         event_tbl.join(org_tbl, org_tbl.c.id == event_tbl.c.organizer_id, isouter=True)
@@ -59,7 +548,7 @@ def build_event_select_query(
         .join(tag_tbl, event_tag_tbl.c.tag_id == tag_tbl.c.id, isouter=True)
     )
 
-    query = (
+    source = (
         select(
             event_tbl.c.id,
             event_tbl.c.organizer_id,
@@ -72,66 +561,95 @@ def build_event_select_query(
             event_tbl.c.status,
             event_tbl.c.start_date,
             event_tbl.c.end_date,
+            event_tbl.c.version,
+            event_tbl.c.country.label("country_id"),
+            event_tbl.c.city.label("city_id"),
             org_tbl.c.organization_name.label("organizer"),
             country_tbl.c.label.label("country"),
             city_tbl.c.label.label("city"),
-            array_agg(
-                func.json_build_object("value", tag_tbl.c.id, "label", tag_tbl.c.label)
+            city_tbl.c.latitude,
+            city_tbl.c.longitude,
+            func.coalesce(
+                func.jsonb_agg(
+                    aggregate_order_by(
+                        func.jsonb_build_object(
+                            "value", tag_tbl.c.id, "label", tag_tbl.c.label
+                        ),
+                        tag_tbl.c.id,
+                    )
+                ).filter(tag_tbl.c.id.is_not(None)),
+                literal_column("'[]'::jsonb"),
             ).label("tags"),
+            func.coalesce(
+                array_agg(
+                    aggregate_order_by(event_tag_tbl.c.tag_id, event_tag_tbl.c.tag_id)
+                ).filter(event_tag_tbl.c.tag_id.is_not(None)),
+                literal_column("'{}'::integer[]"),
+            ).label("tag_ids"),
         )
         .select_from(join_stmt)
         .group_by(
             event_tbl.c.id,
             country_tbl.c.label,
             city_tbl.c.label,
+            city_tbl.c.latitude,
+            city_tbl.c.longitude,
             org_tbl.c.organization_name,
         )
     )
 
-    if city is not None:
-        query = query.where(event_tbl.c.city == city)
+    if event_ids is not None:
+        source = source.where(event_tbl.c.id.in_(event_ids))
+
+    columns = [column.name for column in source.selected_columns]
 
-    if country is not None:
-        query = query.where(event_tbl.c.country == country)
+    query = pg_insert(listing_tbl).from_select(columns, source)
+    query = query.on_conflict_do_update(
+        index_elements=[listing_tbl.c.id],
+        set_={name: query.excluded[name] for name in columns if name != "id"},
+    )
 
-    if tags is not None:
-        query = query.where(event_tag_tbl.c.tag_id.in_(tags))
+    return query
 
-    if start_after is not None:
-        query = query.where(event_tbl.c.start_date > start_after)
 
-    if org_id is not None:
-        query = query.where(event_tbl.c.organizer_id == org_id)
+async def refresh_event_listing(db_session: AsyncSession, event_ids: list[int]):
+    """
+    Rebuild the read model rows of the given events, then recount the
+    calendar cells they move out of and into
+    """
+    old_keys = await event_calendar.calendar_keys(db_session, event_ids)
 
-    if event_id is not None:
-        query = query.where(event_tbl.c.id == event_id)
+    await db_session.execute(build_event_listing_upsert_query(event_ids))
 
-    return query
+    new_keys = await event_calendar.calendar_keys(db_session, event_ids)
+    await event_calendar.refresh_event_calendar(db_session, old_keys | new_keys)
 
 
 async def event_by_org_id(
     db_session: AsyncSession, org_id: int
 ) -> schemas.EventAttribute:
-    query = build_event_select_query(start_after=datetime.datetime.now(), org_id=org_id)
+    query, params = event_statement(start_after=datetime.datetime.now(), org_id=org_id)
 
-    result = (await db_session.execute(query)).first()
+    result = (await db_session.execute(query, params)).first()
 
     if result is None:
         raise exceptions.NotFoundException
 
-    return schemas.EventAttribute(**result._mapping)
+    return event_from_row(result)
 
 
-async def get_event_by_id(db_session: AsyncSession, id: int) -> schemas.EventAttribute:
+async def get_event_by_id(
+    db_session: AsyncSession, id: int, raw: bool = False
+) -> schemas.EventAttribute | dict:
 
-    query = build_event_select_query(event_id=id)
+    query, params = event_statement(event_id=id)
 
-    result = (await db_session.execute(query)).first()
+    result = (await db_session.execute(query, params)).first()
 
     if result is None:
         raise exceptions.NotFoundException
 
-    return schemas.EventAttribute(**result._mapping)
+    return event_from_row(result, raw)
 
 
 async def create_new_event(
@@ -150,25 +668,78 @@ async def create_new_event(
 
     await add_tags_to_event(db_session, inserted_id, event_data.tags)
 
+    event_cache.bump_catalog_version(db_session)
+
     return await get_event_by_id(db_session, inserted_id)
 
 
+async def create_new_events(
+    db_session: AsyncSession, events_data: list[schemas.EventAttributeMid]
+) -> list[schemas.EventAttribute]:
+    """
+    Insert many events in a handful of round trips: one multi-row INSERT for
+    the events, one executemany for their tags, one read model refresh and
+    one read back
+    """
+    event_tbl = db_tables.events
+    event_tag_tbl = db_tables.event_tag
+
+    query = pg_insert(event_tbl).returning(event_tbl.c.id, sort_by_parameter_order=True)
+
+    inserted_ids = (
+        await db_session.execute(
+            query, [event_data.dict(exclude={"tags"}) for event_data in events_data]
+        )
+    ).scalars().all()
+
+    event_tags = [
+        {"event_id": event_id, "tag_id": tag_id}
+        for event_id, event_data in zip(inserted_ids, events_data)
+        for tag_id in event_data.tags or []
+    ]
+    if event_tags:
+        await db_session.execute(pg_insert(event_tag_tbl), event_tags)
+
+    await refresh_event_listing(db_session, inserted_ids)
+
+    event_cache.bump_catalog_version(db_session)
+
+    return await get_events_by_ids(db_session, inserted_ids)
+
+
+async def get_events_by_ids(
+    db_session: AsyncSession, ids: list[int], raw: bool = False
+) -> list[schemas.EventAttribute | dict]:
+    """
+    Load the given events in one query, in the order of ids. Unknown ids are skipped.
+    """
+    # event_statement drops empty filters, an empty list would select every event
+    if not ids:
+        return []
+
+    query, params = event_statement(event_ids=ids)
+
+    rows = {row.id: row for row in (await db_session.execute(query, params)).all()}
+
+    return [event_from_row(rows[id], raw) for id in ids if id in rows]
+
+
 async def add_tags_to_event(
     db_sesion: AsyncSession, event_id: int, tags: list[int] | None
 ):
-    if tags is None:
-        return
-
     event_tag_tbl = db_tables.event_tag
 
-    await db_sesion.execute(
-        pg_insert(event_tag_tbl).values(event_id=event_id),
-        [{"tag_id": tag_id} for tag_id in tags],
-    )
+    if tags:
+        await db_sesion.execute(
+            pg_insert(event_tag_tbl).values(event_id=event_id),
+            [{"tag_id": tag_id} for tag_id in tags],
+        )
+
+    await refresh_event_listing(db_sesion, [event_id])
 
 
 async def update_event(
-    db_session: AsyncSession, event_id: int, event_data: schemas.EventAttribute
+    db_session: AsyncSession, event_id: int, event_data: schemas.EventAttributeIn
 ) -> schemas.EventAttribute:
 
     event_tbl = db_tables.events
@@ -176,15 +747,117 @@ async def update_event(
     query = (
         update(event_tbl)
         .where(event_tbl.c.id == event_id)
-        .values(**event_data.dict(exclude={"id"}))
+        .values(
+            **event_data.dict(exclude={"id", "tags"}),
+            version=event_tbl.c.version + 1,
+            updated_at=func.now(),
+        )
         .returning(event_tbl.c.id)
     )
 
     update_id = (await db_session.execute(query)).scalar()
 
+    if update_id is None:
+        raise exceptions.NotFoundException
+
+    await set_event_tags(db_session, update_id, event_data.tags or [])
+    await refresh_event_listing(db_session, [update_id])
+    event_cache.bump_catalog_version(db_session)
+
     return await get_event_by_id(db_session, update_id)
 
 
+async def patch_event(
+    db_session: AsyncSession, event_id: int, event_data: schemas.EventAttributePatch
+) -> schemas.EventAttribute:
+    """
+    Write only the fields present in event_data, so untouched JSONB documents
+    are not rewritten, and return the refreshed event from RETURNING
+    """
+    event_tbl = db_tables.events
+    listing_tbl = db_tables.event_listing
+
+    changes = event_data.dict(exclude_unset=True, exclude={"tags"})
+
+    query = (
+        update(event_tbl)
+        .where(event_tbl.c.id == event_id)
+        .values(**changes, version=event_tbl.c.version + 1, updated_at=func.now())
+        .returning(event_tbl.c.id)
+    )
+
+    update_id = (await db_session.execute(query)).scalar()
+
+    if update_id is None:
+        raise exceptions.NotFoundException
+
+    if "tags" in event_data.__fields_set__:
+        await set_event_tags(db_session, event_id, event_data.tags)
+
+    calendar_changed = not CALENDAR_FIELDS.isdisjoint(event_data.__fields_set__)
+    if calendar_changed:
+        old_keys = await event_calendar.calendar_keys(db_session, [event_id])
+
+    query = build_event_listing_upsert_query([event_id]).returning(
+        *[listing_tbl.c[field] for field in EVENT_FIELDS]
+    )
+    result = (await db_session.execute(query)).first()
+
+    if calendar_changed:
+        new_keys = await event_calendar.calendar_keys(db_session, [event_id])
+        await event_calendar.refresh_event_calendar(db_session, old_keys | new_keys)
+
+    event_cache.bump_catalog_version(db_session)
+
+    return event_from_row(result)
+
+
+async def set_event_tags(db_session: AsyncSession, event_id: int, tags: list[int]):
+    """
+    Reconcile event_tags with the given tag ids: one DELETE for the tags that
+    went away, one INSERT for the new ones, tags kept are left alone
+    """
+    event_tag_tbl = db_tables.event_tag
+
+    tag_ids = bindparam("tag_ids", tags, type_=ARRAY(Integer))
+
+    await db_session.execute(
+        delete(event_tag_tbl).where(
+            event_tag_tbl.c.event_id == event_id,
+            event_tag_tbl.c.tag_id != all_(tag_ids),
+        )
+    )
+
+    await db_session.execute(
+        pg_insert(event_tag_tbl)
+        .from_select(
+            ["event_id", "tag_id"],
+            select(literal(event_id, Integer), func.unnest(tag_ids)),
+        )
+        .on_conflict_do_nothing()
+    )
+
+
+async def get_event_version(db_session: AsyncSession, id: int) -> int:
+    """
+    Current version of an event, a primary key lookup that skips the read model
+    """
+    event_tbl = db_tables.events
+
+    version = (
+        await db_session.execute(select(event_tbl.c.version).where(event_tbl.c.id == id))
+    ).scalar()
+
+    if version is None:
+        raise exceptions.NotFoundException
+
+    return version
+
+
+def event_etag(id: int, version: int) -> str:
+    return f'W/"event-{id}-{version}"'
+
+
 async def get_organizer_by_id(db_session: AsyncSession, id: int) -> int:
 
     event = await get_event_by_id(db_session, id)
@@ -0,0 +1,94 @@
+from src import schemas
+from src.core.config import settings
+
+from sqlalchemy import event as sa_event
+from sqlalchemy.ext.asyncio import (
+    AsyncSession,
+)
+
+from cachetools import TTLCache
+from typing import Any
+
+
+# Bumped on every event write, every cache key of the event catalog embeds it
+# so nothing cached before a write can be served after it. The version is per
+# process, other workers catch up once their entries expire.
+_catalog_version = 0
+
+_page_cache: TTLCache = TTLCache(
+    maxsize=settings.EVENT_PAGE_CACHE_SIZE,
+    ttl=settings.EVENT_PAGE_CACHE_TTL_SECONDS,
+)
+
+
+def catalog_version() -> int:
+    return _catalog_version
+
+
+def bump_catalog_version(db_session: AsyncSession | None = None):
+    """
+    Bump the catalog version now, and once more when db_session commits so
+    pages read between the write and its commit are dropped as well
+    """
+    global _catalog_version
+    _catalog_version += 1
+
+    if db_session is not None:
+        sa_event.listen(
+            db_session.sync_session,
+            "after_commit",
+            lambda session: bump_catalog_version(),
+            once=True,
+        )
+
+
+def page_key(
+    currentPage: int,
+    pageSize: int,
+    country: int | None = None,
+    city: int | None = None,
+    tags: list[int] | None = None,
+    tag_match: schemas.TagMatch = schemas.TagMatch.ANY,
+    **extra: Any,
+) -> tuple:
+    """
+    Normalized cache key of a listing request, extra holds any other query
+    parameter that changes the response
+    """
+    return (
+        _catalog_version,
+        currentPage,
+        pageSize,
+        country,
+        city,
+        tuple(sorted(set(tags))) if tags else None,
+        tag_match.value if tags else None,
+        tuple(sorted(extra.items())),
+    )
+
+
+def facet_key(
+    country: int | None = None,
+    city: int | None = None,
+    tags: list[int] | None = None,
+    tag_match: schemas.TagMatch = schemas.TagMatch.ANY,
+) -> tuple:
+    return (
+        _catalog_version,
+        "facets",
+        country,
+        city,
+        tuple(sorted(set(tags))) if tags else None,
+        tag_match.value if tags else None,
+    )
+
+
+def get_page(key: tuple) -> tuple[bytes, str] | None:
+    """
+    Rendered body and ETag of a cached page
+    """
+    return _page_cache.get(key)
+
+
+def set_page(key: tuple, body: bytes, etag: str):
+    _page_cache[key] = (body, etag)
@@ -0,0 +1,175 @@
+from src import db_tables
+from src import schemas
+
+from sqlalchemy.ext.asyncio import (
+    AsyncSession,
+)
+
+from sqlalchemy import (
+    select,
+    delete,
+    func,
+    cast,
+    tuple_,
+    column,
+    literal_column,
+    true,
+    Date,
+    Integer,
+)
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+import calendar
+import datetime
+
+
+CalendarKey = tuple[datetime.date, int, int]
+
+# tag_id of the rows counting every event of a day, whatever its tags
+ALL_TAGS = 0
+
+
+def calendar_day(start_date):
+    """
+    Day an event is filed under in the calendar, its start date in UTC
+    """
+    return cast(func.timezone(literal_column("'UTC'"), start_date), Date)
+
+
+async def calendar_keys(
+    db_session: AsyncSession, event_ids: list[int]
+) -> set[CalendarKey]:
+    """
+    (day, country, city) cells the given events currently fall in
+    """
+    listing_tbl = db_tables.event_listing
+
+    query = select(
+        calendar_day(listing_tbl.c.start_date),
+        listing_tbl.c.country_id,
+        listing_tbl.c.city_id,
+    ).where(listing_tbl.c.id.in_(event_ids)).distinct()
+
+    return {tuple(row) for row in (await db_session.execute(query)).all()}
+
+
+def build_event_calendar_rollup_query(keys: set[CalendarKey] | None = None):
+    """
+    INSERT ... SELECT of the calendar counts from event_listing, limited to
+    the given cells when keys is set
+    """
+    listing_tbl = db_tables.event_listing
+    calendar_tbl = db_tables.event_calendar
+
+    day = calendar_day(listing_tbl.c.start_date)
+    tag_id = (
+        func.unnest(
+            func.array_prepend(
+                literal_column(str(ALL_TAGS), Integer),
+                listing_tbl.c.tag_ids,
+                type_=ARRAY(Integer),
+            )
+        )
+        .table_valued(column("tag_id", Integer))
+        .render_derived(name="calendar_tags")
+    )
+
+    query = (
+        select(
+            day.label("day"),
+            listing_tbl.c.country_id,
+            listing_tbl.c.city_id,
+            tag_id.c.tag_id,
+            func.count().label("event_count"),
+        )
+        .select_from(listing_tbl.join(tag_id, true()))
+        .where(listing_tbl.c.status == schemas.EventStatus.PUBLIC)
+        .group_by(day, listing_tbl.c.country_id, listing_tbl.c.city_id, tag_id.c.tag_id)
+    )
+
+    if keys is not None:
+        query = query.where(
+            tuple_(day, listing_tbl.c.country_id, listing_tbl.c.city_id).in_(list(keys))
+        )
+
+    # A concurrent write recounting the same cell may insert first, the
+    # later count wins instead of failing on the primary key
+    insert_query = pg_insert(calendar_tbl).from_select(
+        ["day", "country_id", "city_id", "tag_id", "event_count"], query
+    )
+    return insert_query.on_conflict_do_update(
+        index_elements=[
+            calendar_tbl.c.day,
+            calendar_tbl.c.country_id,
+            calendar_tbl.c.city_id,
+            calendar_tbl.c.tag_id,
+        ],
+        set_={"event_count": insert_query.excluded.event_count},
+    )
+
+
+async def refresh_event_calendar(db_session: AsyncSession, keys: set[CalendarKey]):
+    """
+    Recount the given calendar cells from the read model
+    """
+    if not keys:
+        return
+
+    calendar_tbl = db_tables.event_calendar
+
+    await db_session.execute(
+        delete(calendar_tbl).where(
+            tuple_(
+                calendar_tbl.c.day, calendar_tbl.c.country_id, calendar_tbl.c.city_id
+            ).in_(list(keys))
+        )
+    )
+    await db_session.execute(build_event_calendar_rollup_query(keys))
+
+
+async def rebuild_event_calendar(db_session: AsyncSession):
+    await db_session.execute(delete(db_tables.event_calendar))
+    await db_session.execute(build_event_calendar_rollup_query())
+
+
+async def event_calendar(
+    db_session: AsyncSession,
+    year: int,
+    month: int,
+    country: int | None = None,
+    city: int | None = None,
+    tag: int | None = None,
+) -> list[dict]:
+    """
+    Number of public events starting on each day of the month, read from the
+    rollup only. Days without events are left out.
+    """
+    calendar_tbl = db_tables.event_calendar
+
+    first_day = datetime.date(year, month, 1)
+    last_day = datetime.date(year, month, calendar.monthrange(year, month)[1])
+
+    query = (
+        select(
+            calendar_tbl.c.day,
+            func.sum(calendar_tbl.c.event_count).label("count"),
+        )
+        .where(
+            calendar_tbl.c.day >= first_day,
+            calendar_tbl.c.day <= last_day,
+            calendar_tbl.c.tag_id == (ALL_TAGS if tag is None else tag),
+        )
+        .group_by(calendar_tbl.c.day)
+        .order_by(calendar_tbl.c.day)
+    )
+
+    if country is not None:
+        query = query.where(calendar_tbl.c.country_id == country)
+    if city is not None:
+        query = query.where(calendar_tbl.c.city_id == city)
+
+    return [
+        {"day": row.day, "count": int(row.count)}
+        for row in (await db_session.execute(query)).all()
+    ]
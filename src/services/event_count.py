@@ -0,0 +1,137 @@
+from src import db_tables
+from src import schemas
+from src.core.config import settings
+from src.services import event_cache, event_filters
+from src.utils import explain
+
+from sqlalchemy.ext.asyncio import (
+    AsyncSession,
+)
+
+from sqlalchemy import select, func
+
+from cachetools import TTLCache
+import datetime
+import orjson
+
+
+_count_cache: TTLCache = TTLCache(
+    maxsize=settings.EVENT_COUNT_CACHE_SIZE,
+    ttl=settings.EVENT_COUNT_CACHE_TTL_SECONDS,
+)
+
+
+def _bucket_start_after(
+    start_after: datetime.datetime | None,
+) -> datetime.datetime | None:
+    """
+    Round start_after down to the cache TTL for cache keys, listings pass
+    "now" on every request and would otherwise never share a cache entry
+    """
+    if start_after is None:
+        return None
+
+    ttl = settings.EVENT_COUNT_CACHE_TTL_SECONDS
+    drift = int(start_after.timestamp()) % ttl
+    return start_after.replace(microsecond=0) - datetime.timedelta(seconds=drift)
+
+
+def filter_signature(
+    city: int | None = None,
+    country: int | None = None,
+    tags: list[int] | None = None,
+    tag_match: schemas.TagMatch = schemas.TagMatch.ANY,
+    start_after: datetime.datetime | None = None,
+) -> tuple:
+    return (
+        city,
+        country,
+        tuple(sorted(set(tags))) if tags else None,
+        tag_match.value if tags else None,
+        start_after,
+    )
+
+
+def build_event_count_query(
+    city: int | None = None,
+    country: int | None = None,
+    tags: list[int] | None = None,
+    tag_match: schemas.TagMatch = schemas.TagMatch.ANY,
+    start_after: datetime.datetime | None = None,
+):
+    listing_tbl = db_tables.event_listing
+
+    return select(listing_tbl.c.id).where(
+        *event_filters.listing_filters(
+            city=city,
+            country=country,
+            tags=tags,
+            tag_match=tag_match,
+            start_after=start_after,
+        )
+    )
+
+
+async def estimate_row_count(db_session: AsyncSession, query) -> int:
+    """
+    Number of rows the planner expects the query to return, from table statistics
+    """
+    plan = (await db_session.execute(explain(query))).scalar()
+
+    if isinstance(plan, (str, bytes)):
+        plan = orjson.loads(plan)
+
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+async def count_events(
+    db_session: AsyncSession,
+    city: int | None = None,
+    country: int | None = None,
+    tags: list[int] | None = None,
+    tag_match: schemas.TagMatch = schemas.TagMatch.ANY,
+    start_after: datetime.datetime | None = None,
+    estimated: bool = False,
+) -> int:
+    """
+    Count the events matching the listing filters.
+
+    Counts are cached per filter signature and catalog version. With estimated=True the planner
+    estimate is returned instead whenever it is above
+    EVENT_COUNT_ESTIMATE_THRESHOLD, so huge result sets are never counted
+    exactly.
+    """
+    tags = tags or None
+    # Only the key is rounded, the count itself uses the same start_after as
+    # the page so it never includes events no page can show
+    key = (
+        event_cache.catalog_version(),
+        filter_signature(city, country, tags, tag_match, _bucket_start_after(start_after)),
+        estimated,
+    )
+
+    total = _count_cache.get(key)
+    if total is not None:
+        return total
+
+    query = build_event_count_query(
+        city=city,
+        country=country,
+        tags=tags,
+        tag_match=tag_match,
+        start_after=start_after,
+    )
+
+    total = None
+    if estimated:
+        estimate = await estimate_row_count(db_session, query)
+        if estimate >= settings.EVENT_COUNT_ESTIMATE_THRESHOLD:
+            total = estimate
+
+    if total is None:
+        count_query = select(func.count()).select_from(query.subquery())
+        total = (await db_session.execute(count_query)).scalar()
+
+    _count_cache[key] = total
+    return total
+
@@ -0,0 +1,129 @@
+from src import db_tables
+from src import schemas
+
+from sqlalchemy import any_, func, or_
+
+import datetime
+import math
+
+
+EARTH_RADIUS_KM = 6371.0
+
+
+def search_query(search: str):
+    """
+    tsquery of a free text search, accepts the web search syntax ("quoted", or, -)
+    """
+    return func.websearch_to_tsquery(db_tables.EVENT_SEARCH_CONFIG, search)
+
+
+def search_filter(search: str):
+    return db_tables.event_listing.c.search_vector.bool_op("@@")(search_query(search))
+
+
+def tag_filter(tags: list[int], match: schemas.TagMatch = schemas.TagMatch.ANY):
+    """
+    Match events on their tag_ids array, both operators are served by the GIN index
+    """
+    tag_ids = db_tables.event_listing.c.tag_ids
+
+    if match == schemas.TagMatch.ALL:
+        return tag_ids.contains(tags)
+
+    return tag_ids.overlap(tags)
+
+
+def bounding_box_filter(latitude: float, longitude: float, radius_km: float) -> list:
+    """
+    Latitude/longitude box around a point holding every place within
+    radius_km, a cheap prefilter served by the (latitude, longitude) index
+    """
+    listing_tbl = db_tables.event_listing
+
+    lat_delta = math.degrees(radius_km / EARTH_RADIUS_KM)
+    min_lat, max_lat = latitude - lat_delta, latitude + lat_delta
+    clauses = [listing_tbl.c.latitude.between(min_lat, max_lat)]
+
+    # Near a pole the circle spans every meridian
+    if min_lat <= -90 or max_lat >= 90:
+        return clauses
+
+    lon_delta = math.degrees(
+        math.asin(min(1.0, math.sin(radius_km / EARTH_RADIUS_KM) / math.cos(math.radians(latitude))))
+    )
+    min_lon, max_lon = longitude - lon_delta, longitude + lon_delta
+
+    if min_lon < -180:
+        clauses.append(
+            or_(listing_tbl.c.longitude >= min_lon + 360, listing_tbl.c.longitude <= max_lon)
+        )
+    elif max_lon > 180:
+        clauses.append(
+            or_(listing_tbl.c.longitude >= min_lon, listing_tbl.c.longitude <= max_lon - 360)
+        )
+    else:
+        clauses.append(listing_tbl.c.longitude.between(min_lon, max_lon))
+
+    return clauses
+
+
+def distance_km(latitude: float, longitude: float):
+    """
+    Great circle distance from a point to each event, haversine formula
+    """
+    listing_tbl = db_tables.event_listing
+
+    half_chord = func.power(
+        func.sin(func.radians(listing_tbl.c.latitude - latitude) / 2), 2
+    ) + func.cos(func.radians(latitude)) * func.cos(
+        func.radians(listing_tbl.c.latitude)
+    ) * func.power(
+        func.sin(func.radians(listing_tbl.c.longitude - longitude) / 2), 2
+    )
+
+    return 2 * EARTH_RADIUS_KM * func.asin(func.sqrt(func.least(1.0, half_chord)))
+
+
+def listing_filters(
+    city: int | None = None,
+    country: int | None = None,
+    tags: list[int] | None = None,
+    tag_match: schemas.TagMatch = schemas.TagMatch.ANY,
+    start_after: datetime.datetime | None = None,
+    org_id: int | None = None,
+    event_id: int | None = None,
+    event_ids: list[int] | None = None,
+    search: str | None = None,
+) -> list:
+    """
+    WHERE clauses over event_listing shared by every event read path
+    """
+    listing_tbl = db_tables.event_listing
+
+    clauses = []
+
+    if city is not None:
+        clauses.append(listing_tbl.c.city_id == city)
+
+    if country is not None:
+        clauses.append(listing_tbl.c.country_id == country)
+
+    if tags is not None:
+        clauses.append(tag_filter(tags, tag_match))
+
+    if start_after is not None:
+        clauses.append(listing_tbl.c.start_date > start_after)
+
+    if org_id is not None:
+        clauses.append(listing_tbl.c.organizer_id == org_id)
+
+    if event_id is not None:
+        clauses.append(listing_tbl.c.id == event_id)
+
+    if event_ids is not None:
+        clauses.append(listing_tbl.c.id == any_(event_ids))
+
+    if search is not None:
+        clauses.append(search_filter(search))
+
+    return clauses
@@ -0,0 +1,47 @@
+from src import schemas
+from src.core.config import settings
+from src.exceptions import BadRequestException, ServiceUnavailableException
+
+from cachetools import TTLCache
+import hashlib
+import httpx
+
+
+# Userinfo by token digest, so register followed by login with the same
+# token asks Google once. Raw tokens are never kept.
+_userinfo_cache: TTLCache = TTLCache(
+    maxsize=settings.GOOGLE_USERINFO_CACHE_SIZE,
+    ttl=settings.GOOGLE_USERINFO_CACHE_TTL_SECONDS,
+)
+
+
+def _token_digest(token: str) -> bytes:
+    return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+
+async def fetch_google_data(
+    http_client: httpx.AsyncClient, token: str
+) -> schemas.GoogleCredentalData:
+    digest = _token_digest(token)
+
+    google_data = _userinfo_cache.get(digest)
+    if google_data is not None:
+        return google_data
+
+    try:
+        user_data = await http_client.get(
+            settings.GOOGLE_USERINFO_URL,
+            headers={"Authorization": f"Bearer {token}"},
+        )
+    except httpx.TransportError:
+        raise ServiceUnavailableException("Google sign in is unavailable")
+
+    try:
+        user_data.raise_for_status()
+        google_data = schemas.GoogleCredentalData(**user_data.json())
+    except Exception:
+        # Invalid token
+        raise BadRequestException(detail="Incorrect google token")
+
+    _userinfo_cache[digest] = google_data
+    return google_data
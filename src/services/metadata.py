@@ -22,6 +22,20 @@ async def cities_of_countries(db_session: AsyncSession, country_id: int) -> list
 
     return [schemas.City(label=row._mapping['label'], value=row._mapping['id']) for row in rows]
 
+async def all_cities(db_session: AsyncSession) -> dict[int, list[schemas.City]]:
+    """
+    Every city, grouped by country
+    """
+    rows = await db_session.execute(select(db_tables.cities).order_by(db_tables.cities.c.id))
+
+    cities = {}
+    for row in rows:
+        cities.setdefault(row._mapping['country'], []).append(
+            schemas.City(label=row._mapping['label'], value=row._mapping['id'])
+        )
+
+    return cities
+
 async def all_tags(db_session: AsyncSession) -> list[schemas.Tag]:
 
     rows = await db_session.execute(select(db_tables.tags))
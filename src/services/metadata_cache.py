@@ -0,0 +1,177 @@
+from src import db_tables
+from src import schemas
+from src.core.config import settings
+from src.dependencies.database import SessionFactory
+from src.schemas import responses
+from src.services import metadata
+from src.services.city_index import CityIndex
+
+from sqlalchemy.ext.asyncio import (
+    AsyncSession,
+)
+
+from sqlalchemy import select
+
+from typing import NamedTuple
+import asyncio
+
+
+class MetadataSnapshot(NamedTuple):
+    version: int
+    countries: list[schemas.Country]
+    cities: dict[int, list[schemas.City]]
+    tags: list[schemas.Tag]
+    city_index: CityIndex
+    # Response body and strong ETag of each metadata route, keyed by route
+    rendered: dict[str, tuple[bytes, str]]
+
+    def payload(self, name: str) -> tuple[bytes, str]:
+        return self.rendered.get(name) or self.rendered[EMPTY_CITIES]
+
+
+EMPTY_CITIES = "cities"
+
+
+def cities_payload(country_id: int) -> str:
+    return f"cities:{country_id}"
+
+
+def _rendered(data: dict) -> tuple[bytes, str]:
+    body = responses.render(data=data)
+    return body, responses.strong_etag(body)
+
+
+def render_payloads(
+    countries: list[schemas.Country],
+    cities: dict[int, list[schemas.City]],
+    tags: list[schemas.Tag],
+) -> dict[str, tuple[bytes, str]]:
+    """
+    Serialize every metadata response once, routes then only send bytes
+    """
+    countries_data = [country.dict() for country in countries]
+
+    rendered = {
+        "user": _rendered(
+            {
+                "gender": [
+                    {"label": gender_value.capitalize(), "value": gender_value}
+                    for gender_value in schemas.Gender._member_names_
+                ],
+                "countries": countries_data,
+            }
+        ),
+        "org": _rendered(
+            {
+                "company_size": [
+                    {"label": org_size.capitalize(), "value": org_size}
+                    for org_size in schemas.OrganizationSize._member_names_
+                ],
+                "tags": [tag.dict() for tag in tags],
+                "countries": countries_data,
+            }
+        ),
+        EMPTY_CITIES: _rendered({"cities": []}),
+    }
+
+    for country_id, country_cities in cities.items():
+        rendered[cities_payload(country_id)] = _rendered(
+            {"cities": [city.dict() for city in country_cities]}
+        )
+
+    return rendered
+
+
+# Countries, cities and tags of this process. A reload builds a new snapshot
+# and swaps it in whole, readers never see half of one.
+_snapshot: MetadataSnapshot | None = None
+_reload_lock = asyncio.Lock()
+
+
+async def metadata_version(db_session: AsyncSession) -> int:
+    version_tbl = db_tables.metadata_version
+
+    version = (
+        await db_session.execute(
+            select(version_tbl.c.version).where(version_tbl.c.id == 1)
+        )
+    ).scalar()
+
+    return version or 0
+
+
+async def load_snapshot(db_session: AsyncSession) -> MetadataSnapshot:
+    # The version is read first, a change landing during the load then shows
+    # up as a newer version on the next check instead of being missed
+    version = await metadata_version(db_session)
+
+    countries = await metadata.all_countries(db_session)
+    cities = await metadata.all_cities(db_session)
+    tags = await metadata.all_tags(db_session)
+
+    return MetadataSnapshot(
+        version=version,
+        countries=countries,
+        cities=cities,
+        tags=tags,
+        city_index=CityIndex(cities),
+        rendered=render_payloads(countries, cities, tags),
+    )
+
+
+async def reload(db_session: AsyncSession) -> MetadataSnapshot:
+    global _snapshot
+
+    async with _reload_lock:
+        _snapshot = await load_snapshot(db_session)
+        return _snapshot
+
+
+async def get_snapshot(db_session: AsyncSession) -> MetadataSnapshot:
+    """
+    Current snapshot, loaded on first use or after an invalidation. Concurrent
+    requests wait for a single load.
+    """
+    global _snapshot
+
+    snapshot = _snapshot
+    if snapshot is not None:
+        return snapshot
+
+    async with _reload_lock:
+        if _snapshot is None:
+            _snapshot = await load_snapshot(db_session)
+        return _snapshot
+
+
+def invalidate():
+    """
+    Drop the snapshot, the next request loads a fresh one
+    """
+    global _snapshot
+    _snapshot = None
+
+
+async def refresh_if_stale(db_session: AsyncSession) -> bool:
+    snapshot = _snapshot
+    if snapshot is not None and snapshot.version == await metadata_version(db_session):
+        return False
+
+    await reload(db_session)
+    return True
+
+
+async def watch_version(interval: int = settings.METADATA_VERSION_CHECK_SECONDS):
+    """
+    Compare the snapshot with the database version every interval seconds and
+    reload it when countries, cities or tags changed
+    """
+    while True:
+        await asyncio.sleep(interval)
+
+        try:
+            async with SessionFactory() as db_session:
+                await refresh_if_stale(db_session)
+        except Exception as ex:
+            # Keep serving the snapshot we have, the next check retries
+            print(str(ex))
@@ -6,7 +6,7 @@ from sqlalchemy.ext.asyncio import (
 )
 
 from sqlalchemy import select, insert
-from src.services import user
+from src.services import user, user_cache
 
 from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.dialects.postgresql import array_agg
@@ -163,5 +163,8 @@ async def add_employee(
     )
     await db_session.execute(query)
 
+    # The organization is part of the authenticated user
+    user_cache.invalidate_user(data.user_id, db_session)
+
     result = await get_membership_by_user_id(db_session, data.user_id)
     return result
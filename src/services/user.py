@@ -6,7 +6,8 @@ from sqlalchemy.ext.asyncio import (
     AsyncSession,
 )
 
-from sqlalchemy import select, insert
+from sqlalchemy import select, insert, update, literal, null, String
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 
 
 async def user_exist_by_email(db_session: AsyncSession, email: str) -> bool:
@@ -19,27 +20,52 @@ async def user_exist_by_email(db_session: AsyncSession, email: str) -> bool:
     return id is not None
 
 
+def _new_user_columns():
+    # A user that was just inserted has no organization yet
+    user_tbl = db_tables.users
+
+    return (
+        user_tbl.c.id,
+        user_tbl.c.email,
+        user_tbl.c.first_name,
+        user_tbl.c.last_name,
+        user_tbl.c.birth_date,
+        user_tbl.c.gender,
+        user_tbl.c.avatar,
+        null().label("organization_id"),
+    )
+
+
 async def create_user_by_email(
     db_session: AsyncSession,
     user_data: schemas.UserRegister,
     hashed_password: str | None,
     avatar: str | None,
-) -> schemas.UserResponse:
+) -> schemas.UserResponse | None:
+    """
+    Insert the user and return it, in one statement. None when the email is
+    already registered.
+    """
     user_tbl = db_tables.users
 
-    query = insert(user_tbl).values(
-        first_name=user_data.first_name,
-        last_name=user_data.last_name,
-        email=user_data.email,
-        password=hashed_password,
-        birth_date=user_data.birth_date,
-        gender=user_data.gender,
-        avatar=avatar if avatar is not None else "",
+    query = (
+        pg_insert(user_tbl)
+        .values(
+            first_name=user_data.first_name,
+            last_name=user_data.last_name,
+            email=user_data.email,
+            password=hashed_password,
+            birth_date=user_data.birth_date,
+            gender=user_data.gender,
+            avatar=avatar if avatar is not None else "",
+        )
+        .on_conflict_do_nothing(index_elements=[user_tbl.c.email])
+        .returning(*_new_user_columns())
     )
 
-    (await db_session.execute(query))
+    user = (await db_session.execute(query)).first()
 
-    return await user_detail_by_email(db_session, user_data.email)
+    return schemas.UserResponse(**user._mapping) if user is not None else None
 
 
 async def user_password_by_email(db_session: AsyncSession, email: str) -> str | None:
@@ -52,35 +78,47 @@ async def user_password_by_email(db_session: AsyncSession, email: str) -> str |
     return password
 
 
-async def user_detail_by_email(
-    db_session: AsyncSession, email: str
-) -> schemas.UserResponse:
+async def update_password_by_email(db_session: AsyncSession, email: str, hashed_password: str):
     user_tbl = db_tables.users
-    organization_members_tbl = db_tables.organization_members
-    organizations_tbl = db_tables.organizations
 
-    joined_table = user_tbl.join(
-        organization_members_tbl, organization_members_tbl.c.user_id == user_tbl.c.id, isouter=True
-    ).join(
-        organizations_tbl,
-        organizations_tbl.c.id == organization_members_tbl.c.organization_id, isouter=True
-    )
+    query = update(user_tbl).where(user_tbl.c.email == email).values(password=hashed_password)
 
-    query = (
-        select(
-            user_tbl.c.id,
-            user_tbl.c.email,
-            user_tbl.c.first_name,
-            user_tbl.c.last_name,
-            user_tbl.c.birth_date,
-            user_tbl.c.gender,
-            user_tbl.c.avatar,
-            organization_members_tbl.c.organization_id
+    await db_session.execute(query)
+
+
+def user_profile_query(*extra_columns):
+    """
+    SELECT of a user profile with its organization, one row per user
+    """
+    user_tbl = db_tables.users
+    organization_members_tbl = db_tables.organization_members
+
+    return select(
+        user_tbl.c.id,
+        user_tbl.c.email,
+        user_tbl.c.first_name,
+        user_tbl.c.last_name,
+        user_tbl.c.birth_date,
+        user_tbl.c.gender,
+        user_tbl.c.avatar,
+        organization_members_tbl.c.organization_id,
+        *extra_columns,
+    ).select_from(
+        user_tbl.join(
+            organization_members_tbl,
+            organization_members_tbl.c.user_id == user_tbl.c.id,
+            isouter=True
         )
-        .select_from(joined_table)
-        .where(user_tbl.c.email == email)
     )
 
+
+async def user_detail_by_email(
+    db_session: AsyncSession, email: str
+) -> schemas.UserResponse:
+    user_tbl = db_tables.users
+
+    query = user_profile_query().where(user_tbl.c.email == email)
+
     user = (await db_session.execute(query)).first()
 
     if user is None:
@@ -89,38 +127,36 @@ async def user_detail_by_email(
     return schemas.UserResponse(**user._mapping)
 
 
+async def user_login_by_email(
+    db_session: AsyncSession, email: str
+) -> tuple[str | None, schemas.UserResponse] | None:
+    """
+    Password hash and profile of a user in one query, None for unknown emails
+    """
+    user_tbl = db_tables.users
+
+    query = user_profile_query(user_tbl.c.password).where(user_tbl.c.email == email)
+
+    user = (await db_session.execute(query)).first()
+
+    if user is None:
+        return None
+
+    profile = dict(user._mapping)
+    password = profile.pop("password")
+
+    return password, schemas.UserResponse(**profile)
+
+
 async def get_user_by_google_id(
     db_session: AsyncSession, google_id: str
 ) -> schemas.UserResponse | None:
     user_tbl = db_tables.users
     google_tbl = db_tables.user_google_id
-    organization_members_tbl = db_tables.organization_members
-    organizations_tbl = db_tables.organizations
 
     query = (
-        select(
-            user_tbl.c.id,
-            user_tbl.c.email,
-            user_tbl.c.first_name,
-            user_tbl.c.last_name,
-            user_tbl.c.birth_date,
-            user_tbl.c.gender,
-            user_tbl.c.avatar,
-            organization_members_tbl.c.organization_id
-        )
-        .select_from(
-            user_tbl.join(google_tbl, google_tbl.c.user_id == user_tbl.c.id)
-            .join(
-                organization_members_tbl,
-                organization_members_tbl.c.user_id == user_tbl.c.id,
-                isouter=True
-            )
-            .join(
-                organizations_tbl,
-                organizations_tbl.c.id == organization_members_tbl.c.organization_id,
-                isouter=True
-            )
-        )
+        user_profile_query()
+        .join(google_tbl, google_tbl.c.user_id == user_tbl.c.id)
         .where(google_tbl.c.google_id == google_id)
     )
 
@@ -131,34 +167,9 @@ async def get_user_by_google_id(
 
 async def user_by_id(db_session: AsyncSession, id: int) -> schemas.UserResponse:
     user_tbl = db_tables.users
-    organization_members_tbl = db_tables.organization_members
-    organizations_tbl = db_tables.organizations
 
-    query = (
-        select(
-            user_tbl.c.id,
-            user_tbl.c.email,
-            user_tbl.c.first_name,
-            user_tbl.c.last_name,
-            user_tbl.c.birth_date,
-            user_tbl.c.gender,
-            user_tbl.c.avatar,
-            organization_members_tbl.c.organization_id,
-        )
-        .select_from(
-            user_tbl.join(
-                organization_members_tbl,
-                organization_members_tbl.c.user_id == user_tbl.c.id,
-                isouter=True
-            )
-            .join(
-                organizations_tbl,
-                organizations_tbl.c.id == organization_members_tbl.c.organization_id,
-                isouter=True
-            )
-        )
-        .where(user_tbl.c.id == id)
-    )
+    query = user_profile_query().where(user_tbl.c.id == id)
+
     user = (await db_session.execute(query)).first()
     if user is None:
         raise exceptions.NotFoundException
@@ -170,25 +181,41 @@ async def create_user_by_google_id(
     db_session: AsyncSession,
     google_data: schemas.GoogleCredentalData,
     user_data: schemas.UserBase,
-) -> schemas.UserResponse:
+) -> schemas.UserResponse | None:
+    """
+    Insert the user and link its google id in one statement, the user insert
+    is a CTE the google id insert reads from. None when the email is already
+    registered.
+    """
     user_tbl = db_tables.users
     google_tbl = db_tables.user_google_id
 
-    query = insert(user_tbl).values(
-        first_name=user_data.first_name,
-        last_name=user_data.last_name,
-        email=user_data.email,
-        birth_date=user_data.birth_date,
-        gender=user_data.gender,
-        avatar=google_data.picture,
+    new_user = (
+        pg_insert(user_tbl)
+        .values(
+            first_name=user_data.first_name,
+            last_name=user_data.last_name,
+            email=user_data.email,
+            birth_date=user_data.birth_date,
+            gender=user_data.gender,
+            avatar=google_data.picture,
+        )
+        .on_conflict_do_nothing(index_elements=[user_tbl.c.email])
+        .returning(*_new_user_columns())
+        .cte("new_user")
     )
 
-    (await db_session.execute(query))
-
-    inserted_id = (await db_session.execute(query)).inserted_primary_key[0]
+    new_google_id = (
+        insert(google_tbl)
+        .from_select(
+            ["google_id", "user_id"],
+            select(literal(google_data.sub, String), new_user.c.id),
+        )
+        .cte("new_google_id")
+    )
 
-    query = insert(google_tbl).values(google_id=google_data.sub, user_id=inserted_id)
+    query = select(new_user).add_cte(new_google_id)
 
-    await db_session.execute(query)
+    user = (await db_session.execute(query)).first()
 
-    return await get_user_by_google_id(db_session, google_data.sub)
+    return schemas.UserResponse(**user._mapping) if user is not None else None
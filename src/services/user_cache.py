@@ -0,0 +1,79 @@
+from src import schemas
+from src.core.config import settings
+from src.services import user as user_service
+from src.dependencies.database import SessionFactory
+
+from sqlalchemy import event as sa_event
+from sqlalchemy.ext.asyncio import (
+    AsyncSession,
+)
+
+from cachetools import TTLCache
+import asyncio
+
+
+# Authenticated users by (user id, token jti), bounded and short lived so a
+# change made by another worker shows up within the TTL
+_user_cache: TTLCache = TTLCache(
+    maxsize=settings.USER_CACHE_SIZE,
+    ttl=settings.USER_CACHE_TTL_SECONDS,
+)
+
+# Loads in flight by user id, concurrent requests of a user share one query
+_loading: dict[int, asyncio.Future] = {}
+
+# Bumped on every invalidation, a load that started before one is not cached
+_epoch = 0
+
+
+async def _load_user(user_id: int) -> tuple[int, schemas.UserResponse]:
+    epoch = _epoch
+
+    # Own session, the load is shared and outlives the request that started it
+    async with SessionFactory() as db_session:
+        return epoch, await user_service.user_by_id(db_session, user_id)
+
+
+async def get_user(user_id: int, jti: str | None) -> schemas.UserResponse:
+    key = (user_id, jti)
+
+    user = _user_cache.get(key)
+    if user is not None:
+        return user
+
+    loading = _loading.get(user_id)
+    if loading is None:
+        loading = asyncio.ensure_future(_load_user(user_id))
+        _loading[user_id] = loading
+        loading.add_done_callback(
+            lambda future: _loading.pop(user_id, None) if _loading.get(user_id) is future else None
+        )
+
+    # Shielded, one waiter going away does not cancel the load for the others
+    epoch, user = await asyncio.shield(loading)
+
+    if epoch == _epoch:
+        _user_cache[key] = user
+
+    return user
+
+
+def invalidate_user(user_id: int, db_session: AsyncSession | None = None):
+    """
+    Drop the cached user now, and once more when db_session commits so a load
+    reading between the write and its commit is dropped as well
+    """
+    global _epoch
+    _epoch += 1
+
+    for key in [key for key in _user_cache if key[0] == user_id]:
+        _user_cache.pop(key, None)
+    _loading.pop(user_id, None)
+
+    if db_session is not None:
+        sa_event.listen(
+            db_session.sync_session,
+            "after_commit",
+            lambda session: invalidate_user(user_id),
+            once=True,
+        )
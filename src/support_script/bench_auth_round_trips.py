@@ -0,0 +1,107 @@
+"""
+Database round trips and latency of the email auth flows, the queries the
+auth routes ran before against the single statement versions of
+src.services.user. Runs against the configured database, every flow is
+rolled back.
+
+python -m src.support_script.bench_auth_round_trips
+"""
+import asyncio
+import datetime
+import time
+import uuid
+
+from sqlalchemy import event, insert, select
+
+from src import db_tables, schemas
+from src.dependencies.database import SessionFactory, engine
+from src.services import user as user_service
+
+ROUNDS = 200
+
+round_trips = 0
+
+
+@event.listens_for(engine.sync_engine, "before_cursor_execute")
+def count_round_trip(*args):
+    global round_trips
+    round_trips += 1
+
+
+def new_user() -> schemas.UserRegister:
+    return schemas.UserRegister(
+        email=f"bench-{uuid.uuid4().hex}@example.com",
+        first_name="Bench",
+        last_name="User",
+        birth_date=datetime.datetime(2000, 1, 1),
+        gender=schemas.Gender.UNDISCLOSED,
+        password="password",
+        confirm_password="password",
+    )
+
+
+async def register_before(db_session, user_data):
+    # Existence check, INSERT, then read the profile back
+    user_tbl = db_tables.users
+
+    await user_service.user_exist_by_email(db_session, user_data.email)
+    await db_session.execute(
+        insert(user_tbl).values(
+            **user_data.dict(exclude={"password", "confirm_password"}), password="x", avatar=""
+        )
+    )
+    return await user_service.user_detail_by_email(db_session, user_data.email)
+
+
+async def register_after(db_session, user_data):
+    return await user_service.create_user_by_email(db_session, user_data, "x", None)
+
+
+async def login_before(db_session, user_data):
+    # Password hash, then the profile
+    user_tbl = db_tables.users
+
+    await db_session.execute(select(user_tbl.c.password).where(user_tbl.c.email == user_data.email))
+    return await user_service.user_detail_by_email(db_session, user_data.email)
+
+
+async def login_after(db_session, user_data):
+    return await user_service.user_login_by_email(db_session, user_data.email)
+
+
+async def measure(name, register, login):
+    global round_trips
+    register_trips = login_trips = 0
+    started = time.perf_counter()
+
+    for _ in range(ROUNDS):
+        async with SessionFactory() as db_session:
+            user_data = new_user()
+
+            round_trips = 0
+            await register(db_session, user_data)
+            register_trips += round_trips
+
+            round_trips = 0
+            await login(db_session, user_data)
+            login_trips += round_trips
+
+            await db_session.rollback()
+
+    elapsed = time.perf_counter() - started
+    print(
+        f"{name:<8} register {register_trips / ROUNDS:4.1f} round trips, "
+        f"login {login_trips / ROUNDS:4.1f} round trips, "
+        f"{elapsed / ROUNDS * 1e3:6.2f} ms per register + login"
+    )
+
+
+async def main():
+    engine.echo = False
+    await measure("before", register_before, login_before)
+    await measure("after", register_after, login_after)
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,64 @@
+"""
+Per-request Python overhead of building the event listing statement, before
+and after the statement cache of src.services.event.
+
+python -m src.support_script.bench_event_query
+"""
+import datetime
+import timeit
+
+from sqlalchemy.dialects.postgresql import asyncpg
+
+from src import db_tables, schemas
+from src.services import event
+
+ROUNDS = 5000
+
+dialect = asyncpg.dialect()
+listing_tbl = db_tables.event_listing
+
+filters = dict(
+    city=3,
+    country=1,
+    tags=[4, 9, 12],
+    start_after=datetime.datetime.now(),
+)
+
+
+def build_per_request():
+    # What every listing call did before: build the statement with the
+    # values inlined, then let the engine compute its cache key
+    query = (
+        event.build_event_select_query(tag_match=schemas.TagMatch.ANY, **filters)
+        .order_by(listing_tbl.c.start_date, listing_tbl.c.id)
+        .limit(7)
+        .offset(6)
+    )
+    query._generate_cache_key()
+    return query
+
+
+def build_and_compile_per_request():
+    # Same as above when the statement misses the engine compiled cache
+    build_per_request().compile(dialect=dialect)
+
+
+def cached_statement():
+    query, params = event.event_statement(
+        event.EventQueryMode.PAGE, tag_match=schemas.TagMatch.ANY, **filters
+    )
+    params["limit"] = 7
+    params["offset"] = 6
+    query._generate_cache_key()
+    return query
+
+
+def report(name, func):
+    seconds = min(timeit.repeat(func, number=ROUNDS, repeat=3))
+    print(f"{name:<32} {seconds / ROUNDS * 1e6:10.1f} us/request")
+
+
+if __name__ == "__main__":
+    report("build per request", build_per_request)
+    report("build + compile per request", build_and_compile_per_request)
+    report("cached statement", cached_statement)
@@ -0,0 +1,46 @@
+"""
+Per-request Python overhead of verifying the access token, python-jose on
+every request against the verified-token cache of src.core.jwt.
+
+python -m src.support_script.bench_token_decode
+"""
+import timeit
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from jose import jwt
+
+from src.core import config
+from src.core import jwt as core_jwt
+
+ROUNDS = 20000
+
+token = jwt.encode(
+    {
+        core_jwt.SUB: "42",
+        core_jwt.JTI: str(uuid.uuid4()),
+        core_jwt.IAT: datetime.now(timezone.utc),
+        core_jwt.EXP: datetime.now(timezone.utc) + timedelta(hours=1),
+    },
+    config.settings.SECRET_KEY,
+    algorithm=config.settings.ALGORITHM,
+)
+
+
+def jose_per_request():
+    # What decode_token did before: verify the signature and parse the claims
+    jwt.decode(token, config.settings.SECRET_KEY, algorithms=[config.settings.ALGORITHM])
+
+
+def cached_token():
+    core_jwt.decode_token(token)
+
+
+def report(name, func):
+    seconds = min(timeit.repeat(func, number=ROUNDS, repeat=3))
+    print(f"{name:<32} {seconds / ROUNDS * 1e6:10.1f} us/request")
+
+
+if __name__ == "__main__":
+    report("python-jose per request", jose_per_request)
+    report("verified token cache", cached_token)
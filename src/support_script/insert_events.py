@@ -1,11 +1,13 @@
 import json
 from sqlalchemy import create_engine, select
 from sqlalchemy.orm import sessionmaker
-from src.db_tables import events, event_tag  # Adjust import according to your structure
+from src.db_tables import events, event_tag, event_calendar  # Adjust import according to your structure
 from src.core import config
 from pydantic import PostgresDsn
 import os
 from sqlalchemy.dialects.postgresql import insert as pg_insert
+from src.services.event import build_event_listing_upsert_query
+from src.services.event_calendar import build_event_calendar_rollup_query
 
 script_dir = os.path.dirname(os.path.abspath(__file__))
 
@@ -56,6 +58,13 @@ def insert_events_from_json(json_data):
             [{"tag_id": tag_id} for tag_id in event["tags"]],
         )
 
+    # Rebuild the listing read model for the new events
+    session.execute(build_event_listing_upsert_query())
+
+    # And recount the calendar rollup from it
+    session.execute(event_calendar.delete())
+    session.execute(build_event_calendar_rollup_query())
+
     # Commit the transaction
     session.commit()
 
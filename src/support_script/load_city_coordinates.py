@@ -0,0 +1,40 @@
+import asyncio
+import csv
+import sys
+
+from sqlalchemy import bindparam, update
+
+from src import db_tables
+from src.dependencies.database import SessionFactory
+from src.services.event import build_event_listing_upsert_query
+
+
+def load_csv(file_path):
+    # Rows of city_id,latitude,longitude
+    with open(file_path, newline="") as file:
+        return [
+            {"city_id": int(city_id), "latitude": float(lat), "longitude": float(lon)}
+            for city_id, lat, lon in csv.reader(file)
+        ]
+
+
+async def main(file_path):
+    city_tbl = db_tables.cities
+
+    query = (
+        update(city_tbl)
+        .where(city_tbl.c.id == bindparam("city_id"))
+        .values(latitude=bindparam("latitude"), longitude=bindparam("longitude"))
+    )
+
+    async with SessionFactory() as session:
+        await session.connection()
+        await session.execute(query, load_csv(file_path))
+
+        # The read model carries the city coordinates, rebuild it
+        await session.execute(build_event_listing_upsert_query())
+        await session.commit()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(sys.argv[1]))
@@ -0,0 +1,16 @@
+import asyncio
+
+from src.dependencies.database import SessionFactory
+from src.services.event_calendar import rebuild_event_calendar
+
+
+async def main():
+    # Recount the whole calendar rollup from event_listing, for backfills
+    # and after bulk loads that bypass the services
+    async with SessionFactory() as session:
+        await rebuild_event_calendar(session)
+        await session.commit()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,11 +1,12 @@
 import ast
 import json
-import requests
 
 from sqlalchemy import create_engine, select
 from sqlalchemy.orm import sessionmaker
-from src.db_tables import organizations
+from src.db_tables import organizations, countries as country_tbl, cities as city_tbl
 from src.core import config
+from src import schemas
+from src.services.city_index import CityIndex, normalize_name
 from pydantic import PostgresDsn
 import os
 
@@ -25,11 +26,17 @@ engine = create_engine(PG_URL)
 Session = sessionmaker(bind=engine)
 session = Session()
 
-base_url = 'http://192.168.31.115:8001'
+# Countries and cities are looked up in memory, once, instead of calling the
+# metadata endpoints for every vendor
+countries = {
+    normalize_name(row.label): row.id for row in session.execute(select(country_tbl))
+}
 
-response = (requests.get(f"{base_url}/metadata/org")).json()
+cities_by_country = {}
+for row in session.execute(select(city_tbl)):
+    cities_by_country.setdefault(row.country, []).append(schemas.City(label=row.label, value=row.id))
 
-countries = {entry["label"]: entry["value"] for entry in response["data"]["countries"]}
+city_index = CityIndex(cities_by_country)
 
 def load_data(file_path):
     with open(file_path, 'r') as file:
@@ -48,12 +55,9 @@ def edit_vendor_data(vendor):
     city = split_addr[1].strip()
     country = split_addr[2].strip()
 
-    country_id = countries[country]
+    country_id = countries[normalize_name(country)]
 
-    response = (requests.get(f"{base_url}/metadata/cities/{country_id}")).json()
-    cities = {entry["label"]: entry["value"] for entry in response["data"]["cities"]}
-
-    city_id = cities[city]
+    city_id = city_index.find(city, country_id).value
 
 
     return {
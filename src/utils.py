@@ -1,4 +1,5 @@
 from sqlalchemy.sql import expression
+from sqlalchemy.sql.expression import ClauseElement, Executable
 from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.types import DateTime
 
@@ -11,3 +12,19 @@ class utcnow(expression.FunctionElement):
 @compiles(utcnow, "postgresql")
 def pg_utcnow(element, compiler, **kw):
     return "TIMEZONE('utc', CURRENT_TIMESTAMP)"
+
+
+class explain(Executable, ClauseElement):
+    """
+    EXPLAIN a statement and get the planner output back as JSON
+    """
+
+    inherit_cache = False
+
+    def __init__(self, statement):
+        self.statement = statement
+
+
+@compiles(explain, "postgresql")
+def pg_explain(element, compiler, **kw):
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)